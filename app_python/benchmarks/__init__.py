@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the Python service.
+
+Run from ``app_python`` with ``poetry run python -m benchmarks.<name>``.
+"""
@@ -0,0 +1,60 @@
+"""Shared timing and reporting helpers for benchmark scripts."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from statistics import quantiles
+import tempfile
+from time import perf_counter_ns
+
+import src.router as router
+from src.flask_instance import app
+
+
+def time_calls(func: Callable[[], object], iterations: int) -> list[float]:
+    """Call ``func`` repeatedly and return per-call durations in microseconds."""
+    durations: list[float] = []
+    for _ in range(iterations):
+        start = perf_counter_ns()
+        func()
+        durations.append((perf_counter_ns() - start) / 1000)
+    return durations
+
+
+def summarize(durations: list[float]) -> dict[str, float]:
+    """Return mean and tail percentiles for a list of durations."""
+    cuts = quantiles(durations, n=100, method="inclusive")
+    return {
+        "mean_us": sum(durations) / len(durations),
+        "p50_us": cuts[49],
+        "p99_us": cuts[98],
+    }
+
+
+def print_table(rows: list[tuple[str, dict[str, float]]]) -> None:
+    """Print benchmark results as an aligned text table."""
+    width = max(len(name) for name, _ in rows)
+    print(f"{'case':<{width}}  {'mean_us':>10}  {'p50_us':>10}  {'p99_us':>10}")
+    for name, stats in rows:
+        print(
+            f"{name:<{width}}  {stats['mean_us']:>10.1f}  "
+            f"{stats['p50_us']:>10.1f}  {stats['p99_us']:>10.1f}"
+        )
+
+
+@contextmanager
+def isolated_client() -> Iterator:
+    """Yield a Flask test client with the visits file in a temp directory."""
+    original_visits_file = router.VISITS_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        router.VISITS_FILE = Path(tmp_dir) / "visits"
+        # A breaker left open by a previous faulty run would skip storage here.
+        router.VISITS_BREAKER.reset()
+        app.config.update(TESTING=True)
+        try:
+            with app.test_client() as client:
+                yield client
+        finally:
+            router.VISITS_FILE = original_visits_file
@@ -0,0 +1,40 @@
+"""Per-section cost of the index payload.
+
+Times each section builder on its own, then ``GET /?fields=<section>`` against
+the full ``GET /`` so the cost of skipped sections is visible.
+
+    poetry run python -m benchmarks.index_sections [iterations]
+"""
+
+from __future__ import annotations
+
+import sys
+
+import src.router as router
+from src.flask_instance import app
+
+from .common import isolated_client, print_table, summarize, time_calls
+
+
+def main(iterations: int = 2000) -> None:
+    rows = []
+    with app.test_request_context("/"):
+        for section in router.INDEX_SECTIONS:
+            durations = time_calls(
+                lambda section=section: router.build_index_section(section), iterations
+            )
+            rows.append((f"build {section}", summarize(durations)))
+
+    with isolated_client() as client:
+        for section in router.INDEX_SECTIONS:
+            durations = time_calls(
+                lambda section=section: client.get(f"/?fields={section}"), iterations
+            )
+            rows.append((f"GET /?fields={section}", summarize(durations)))
+        rows.append(("GET /", summarize(time_calls(lambda: client.get("/"), iterations))))
+
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
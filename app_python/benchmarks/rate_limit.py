@@ -0,0 +1,77 @@
+"""Per-request cost of the rate limiter lookup.
+
+Measures ``RateLimiter.check`` for a hot set of repeat clients, for a table
+pinned at its size cap by one-off (sprayed) client keys, and the full
+``GET /visits`` path with and without a limit configured.
+
+    poetry run python -m benchmarks.rate_limit [iterations]
+"""
+
+from __future__ import annotations
+
+from itertools import count
+import sys
+
+import src.rate_limit as rate_limit
+from src.rate_limit import InMemoryBackend, RateLimit, RateLimiter
+
+from .common import isolated_client, print_table, summarize, time_calls
+
+
+def main(iterations: int = 20000) -> None:
+    limits = {"/visits": RateLimit(rate=1e9, burst=1e9)}
+    rows = []
+
+    hot = RateLimiter(limits, InMemoryBackend(max_entries=10000))
+    clients = [f"10.0.{i // 256}.{i % 256}" for i in range(1000)]
+    ids = count()
+    rows.append(
+        (
+            "check, 1k repeat clients",
+            summarize(
+                time_calls(
+                    lambda: hot.check("/visits", clients[next(ids) % len(clients)]),
+                    iterations,
+                )
+            ),
+        )
+    )
+
+    sprayed = RateLimiter(limits, InMemoryBackend(max_entries=10000))
+    for i in range(10000):
+        sprayed.check("/visits", f"warmup-{i}")
+    rows.append(
+        (
+            "check, sprayed keys at cap",
+            summarize(
+                time_calls(lambda: sprayed.check("/visits", f"spray-{next(ids)}"), iterations)
+            ),
+        )
+    )
+
+    original = rate_limit.RATE_LIMITER
+    request_iterations = max(1, iterations // 10)
+    try:
+        with isolated_client() as client:
+            rate_limit.RATE_LIMITER = RateLimiter({}, InMemoryBackend())
+            rows.append(
+                (
+                    "GET /visits, no limits",
+                    summarize(time_calls(lambda: client.get("/visits"), request_iterations)),
+                )
+            )
+            rate_limit.RATE_LIMITER = RateLimiter(limits, InMemoryBackend())
+            rows.append(
+                (
+                    "GET /visits, limited",
+                    summarize(time_calls(lambda: client.get("/visits"), request_iterations)),
+                )
+            )
+    finally:
+        rate_limit.RATE_LIMITER = original
+
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
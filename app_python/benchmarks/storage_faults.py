@@ -0,0 +1,189 @@
+"""Fault injection for the visits counter file.
+
+``FaultyPath`` wraps the real ``VISITS_FILE`` path and injects latency,
+``OSError`` failures and torn writes into the calls made by
+``_read_visits_count``, ``_write_visits_count``, the read cache and the
+visit history file next to it, so slow or failing network-backed volumes
+can be reproduced locally::
+
+    with inject_visits_faults(PROFILES["stalls"]):
+        client.get("/")
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import errno
+from math import log
+import os
+from pathlib import Path
+import random
+from time import sleep as _sleep
+
+import src.router as router
+
+LatencyDistribution = Callable[[random.Random], float]
+
+
+def no_latency(rng: random.Random) -> float:  # noqa: ARG001
+    return 0.0
+
+
+def constant(seconds: float) -> LatencyDistribution:
+    """Always delay by ``seconds``."""
+    return lambda rng: seconds
+
+
+def lognormal(median: float, sigma: float) -> LatencyDistribution:
+    """Long-tailed delays around ``median`` seconds."""
+    return lambda rng: rng.lognormvariate(log(median), sigma)
+
+
+def spikes(base: float, stall: float, probability: float) -> LatencyDistribution:
+    """Delay by ``base`` seconds, or by ``stall`` seconds with ``probability``."""
+    return lambda rng: stall if rng.random() < probability else base
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Faults applied to every storage call made through a ``FaultyPath``.
+
+    Latency applies to ``stat``, reads and writes. Errors are drawn from
+    ``error_codes``. A torn write stores a strict prefix of the data and then
+    fails with ``EIO``, like a volume dropping out mid-write.
+    """
+
+    name: str
+    latency: LatencyDistribution = no_latency
+    read_error_rate: float = 0.0
+    write_error_rate: float = 0.0
+    error_codes: tuple[int, ...] = (errno.EIO,)
+    torn_write_rate: float = 0.0
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        FaultProfile("healthy"),
+        FaultProfile("slow_disk", latency=lognormal(0.002, 0.8)),
+        FaultProfile("stalls", latency=spikes(0.0005, 0.25, 0.02)),
+        FaultProfile("disk_full", write_error_rate=1.0, error_codes=(errno.ENOSPC,)),
+        FaultProfile("flaky_io", read_error_rate=0.05, write_error_rate=0.05),
+        FaultProfile("torn_writes", torn_write_rate=0.05),
+    )
+}
+
+
+class FaultyPath:
+    """``Path`` stand-in that injects a ``FaultProfile`` into file I/O.
+
+    ``stat`` and the text and bytes reads and writes are faulted; other calls
+    are delegated to the wrapped path untouched. Paths derived with
+    ``parent``, ``with_name``, ``with_suffix`` or ``/`` are wrapped too and
+    share the profile, random stream and ``injected`` counts.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        profile: FaultProfile,
+        seed: int = 0,
+        sleep: Callable[[float], None] = _sleep,
+    ) -> None:
+        self.path = path
+        self.profile = profile
+        self.injected: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+
+    def __getattr__(self, name: str):
+        return getattr(self.path, name)
+
+    def __fspath__(self) -> str:
+        return os.fspath(self.path)
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FaultyPath):
+            return NotImplemented
+        return (self.path, self.profile) == (other.path, other.profile)
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __truediv__(self, other: str) -> FaultyPath:
+        return self._derive(self.path / other)
+
+    @property
+    def parent(self) -> FaultyPath:
+        return self._derive(self.path.parent)
+
+    def with_name(self, name: str) -> FaultyPath:
+        return self._derive(self.path.with_name(name))
+
+    def with_suffix(self, suffix: str) -> FaultyPath:
+        return self._derive(self.path.with_suffix(suffix))
+
+    def stat(self, *args, **kwargs) -> os.stat_result:
+        self._delay()
+        return self.path.stat(*args, **kwargs)
+
+    def read_text(self, *args, **kwargs) -> str:
+        self._delay()
+        self._maybe_fail("read", self.profile.read_error_rate)
+        return self.path.read_text(*args, **kwargs)
+
+    def read_bytes(self) -> bytes:
+        self._delay()
+        self._maybe_fail("read", self.profile.read_error_rate)
+        return self.path.read_bytes()
+
+    def write_text(self, data: str, *args, **kwargs) -> int:
+        return self._write(self.path.write_text, data, *args, **kwargs)
+
+    def write_bytes(self, data: bytes) -> int:
+        return self._write(self.path.write_bytes, data)
+
+    def _derive(self, path: Path) -> FaultyPath:
+        derived = FaultyPath(path, self.profile, sleep=self._sleep)
+        derived.injected = self.injected
+        derived._rng = self._rng
+        return derived
+
+    def _write(self, write: Callable[..., int], data, *args, **kwargs) -> int:
+        self._delay()
+        self._maybe_fail("write", self.profile.write_error_rate)
+        if data and self._rng.random() < self.profile.torn_write_rate:
+            self.injected["torn_write"] += 1
+            write(data[:self._rng.randrange(len(data))], *args, **kwargs)
+            raise OSError(errno.EIO, os.strerror(errno.EIO), str(self.path))
+        return write(data, *args, **kwargs)
+
+    def _delay(self) -> None:
+        seconds = self.profile.latency(self._rng)
+        if seconds > 0:
+            self.injected["delayed"] += 1
+            self._sleep(seconds)
+
+    def _maybe_fail(self, operation: str, rate: float) -> None:
+        if rate and self._rng.random() < rate:
+            code = self._rng.choice(self.profile.error_codes)
+            self.injected[f"{operation}_{errno.errorcode[code]}"] += 1
+            raise OSError(code, os.strerror(code), str(self.path))
+
+
+@contextmanager
+def inject_visits_faults(profile: FaultProfile, seed: int = 0, **kwargs) -> Iterator[FaultyPath]:
+    """Route ``router.VISITS_FILE`` through a ``FaultyPath`` for the block."""
+    original = router.VISITS_FILE
+    faulty = FaultyPath(original, profile, seed=seed, **kwargs)
+    router.VISITS_FILE = faulty
+    try:
+        yield faulty
+    finally:
+        router.VISITS_FILE = original
@@ -0,0 +1,52 @@
+"""Extra cost of visit history on the increment path.
+
+Times ``RingCounter.add`` and ``VisitHistory.record`` in isolation, then
+``increment_visits_count`` (file write plus history) against a bare
+read-and-write of the counter file.
+
+    poetry run python -m benchmarks.visit_history [iterations]
+"""
+
+from __future__ import annotations
+
+import sys
+from time import time
+
+import src.router as router
+from src.visit_history import RingCounter, VisitHistory
+
+from .common import isolated_client, print_table, summarize, time_calls
+
+
+def _bare_increment() -> None:
+    with router._VISITS_LOCK:
+        router._write_visits_count(router._read_visits_count() + 1)
+
+
+def main(iterations: int = 20000) -> None:
+    ring = RingCounter(24 * 60, 60)
+    history = VisitHistory(path=None)
+    rows = [
+        ("RingCounter.add", summarize(time_calls(lambda: ring.add(time()), iterations))),
+        (
+            "VisitHistory.record",
+            summarize(time_calls(lambda: history.record(time()), iterations)),
+        ),
+    ]
+
+    with isolated_client():
+        rows.append(("bare counter increment", summarize(time_calls(_bare_increment, iterations))))
+        rows.append(
+            (
+                "increment_visits_count",
+                summarize(time_calls(router.increment_visits_count, iterations)),
+            )
+        )
+
+    history_bytes = sum(len(r) * r.itemsize for r in history._rings())
+    print_table(rows)
+    print(f"history memory: {history_bytes} bytes")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,54 @@
+"""Latency of ``GET /`` and ``GET /visits`` under injected storage faults.
+
+Runs each profile from ``benchmarks.storage_faults.PROFILES`` (or the ones
+named on the command line) against a fresh visits file and reports latency
+percentiles plus non-2xx responses per endpoint.
+
+    poetry run python -m benchmarks.visits_faults [iterations] [profile ...]
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import sys
+
+from src.flask_instance import app
+
+from .common import isolated_client, print_table, summarize, time_calls
+from .storage_faults import PROFILES, inject_visits_faults
+
+ENDPOINTS = ("/", "/visits")
+
+
+def main(iterations: int = 300, profile_names: list[str] | None = None) -> None:
+    rows = []
+    failures: dict[str, Counter[int]] = {}
+    injected: dict[str, Counter[str]] = {}
+    for name in profile_names or list(PROFILES):
+        with isolated_client() as client, inject_visits_faults(PROFILES[name]) as faulty:
+            # Report storage failures as 500 responses instead of raising.
+            app.config.update(PROPAGATE_EXCEPTIONS=False)
+            for path in ENDPOINTS:
+                statuses: Counter[int] = Counter()
+
+                def request(path=path, statuses=statuses) -> None:
+                    statuses[client.get(path).status_code] += 1
+
+                case = f"{name} GET {path}"
+                rows.append((case, summarize(time_calls(request, iterations))))
+                failures[case] = Counter(
+                    {status: count for status, count in statuses.items() if status >= 300}
+                )
+            injected[name] = faulty.injected
+
+    print_table(rows)
+    print()
+    for case, statuses in failures.items():
+        if statuses:
+            print(f"{case}: {dict(sorted(statuses.items()))}")
+    for name, counts in injected.items():
+        print(f"{name} injected: {dict(sorted(counts.items())) or 'nothing'}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300, sys.argv[2:] or None)
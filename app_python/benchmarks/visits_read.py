@@ -0,0 +1,83 @@
+"""Read-heavy throughput of ``GET /visits`` storage reads.
+
+Compares the previous read path (take ``_VISITS_LOCK``, read and parse the
+file on every call) with the stat-validated cache in ``get_visits_count``,
+first per call, then as reads per second from several threads while one
+thread keeps incrementing the counter.
+
+    poetry run python -m benchmarks.visits_read [iterations] [threads]
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from time import perf_counter, sleep
+
+import src.router as router
+
+from .common import isolated_client, print_table, summarize, time_calls
+
+DURATION_SECONDS = 1.0
+WRITE_INTERVAL_SECONDS = 0.1
+
+
+def _locked_read() -> int:
+    with router._VISITS_LOCK:
+        return router._read_visits_count()
+
+
+def _throughput(read, threads: int) -> float:
+    """Return reads per second from ``threads`` readers next to one writer."""
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def reader(slot: int) -> None:
+        while not stop.is_set():
+            read()
+            counts[slot] += 1
+
+    def writer() -> None:
+        while not stop.is_set():
+            router.increment_visits_count()
+            sleep(WRITE_INTERVAL_SECONDS)
+
+    workers = [threading.Thread(target=reader, args=(slot,)) for slot in range(threads)]
+    workers.append(threading.Thread(target=writer))
+    start = perf_counter()
+    for worker in workers:
+        worker.start()
+    sleep(DURATION_SECONDS)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (perf_counter() - start)
+
+
+def main(iterations: int = 20000, threads: int = 4) -> None:
+    with isolated_client():
+        router._write_visits_count(42)
+        sleep(router.VISITS_CACHE_RACY_NS / 1e9)
+        print_table(
+            [
+                ("locked read + parse", summarize(time_calls(_locked_read, iterations))),
+                (
+                    "get_visits_count (cached)",
+                    summarize(time_calls(router.get_visits_count, iterations)),
+                ),
+            ]
+        )
+
+        print(f"\n{threads} readers + 1 writer every {WRITE_INTERVAL_SECONDS * 1000:.0f} ms")
+        for name, read in (
+            ("locked read + parse", _locked_read),
+            ("get_visits_count (cached)", router.get_visits_count),
+        ):
+            print(f"{name:<26}  {_throughput(read, threads):>12,.0f} reads/s")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    )
@@ -6,7 +6,14 @@
 
 bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
 workers = int(os.getenv("GUNICORN_WORKERS", "1"))
-accesslog = "-"
+# More than one thread switches gunicorn to the gthread worker, which is what
+# lets in-process admission control see (and shed) concurrent requests.
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+# The app writes its own JSON access log (see src/access_log.py); gunicorn's
+# format-string access log is only kept for ACCESS_LOG_MODE=gunicorn.
+accesslog = "-" if os.getenv("ACCESS_LOG_MODE", "app").lower() == "gunicorn" else None
+# Must exceed SHUTDOWN_DRAIN_DELAY_SECONDS + SHUTDOWN_DRAIN_TIMEOUT_SECONDS.
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
 errorlog = "-"
 loglevel = os.getenv("LOG_LEVEL", "info").lower()
 access_log_format = (
@@ -15,3 +22,10 @@
     '"status_code":%(s)s,"response_bytes":"%(B)s","request_time_us":%(D)s,'
     '"user_agent":"%(a)s"}'
 )
+
+
+def post_worker_init(worker) -> None:
+    """Drain gracefully on SIGTERM instead of stopping the worker right away."""
+    from src.shutdown import install_gunicorn_drain
+
+    install_gunicorn_drain(worker)
@@ -0,0 +1,64 @@
+"""Structured per-request access logging with sampling and a slow-only mode."""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+
+from flask import Request, Response
+
+try:
+    from .logging_utils import configure_json_logger
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from logging_utils import configure_json_logger
+
+# "app" logs from the Flask hooks, "gunicorn" keeps gunicorn's own access log,
+# "off" disables access logging entirely.
+ACCESS_LOG_MODE = os.getenv("ACCESS_LOG_MODE", "app").lower()
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "0"))
+ACCESS_LOG_SLOW_ONLY = os.getenv("ACCESS_LOG_SLOW_ONLY", "False").lower() == "true"
+
+access_logger = configure_json_logger("devops_info_service.access")
+
+
+def should_log_access(status_code: int, duration: float) -> bool:
+    """Decide whether a finished request gets an access log line.
+
+    Server errors and requests slower than ``ACCESS_LOG_SLOW_MS`` are always
+    logged. Everything else is dropped in slow-only mode and otherwise kept
+    with probability ``ACCESS_LOG_SAMPLE_RATE``.
+    """
+    if ACCESS_LOG_MODE != "app":
+        return False
+    if status_code >= 500:
+        return True
+    if ACCESS_LOG_SLOW_MS > 0 and duration * 1000 >= ACCESS_LOG_SLOW_MS:
+        return True
+    if ACCESS_LOG_SLOW_ONLY:
+        return False
+    return ACCESS_LOG_SAMPLE_RATE >= 1.0 or random.random() < ACCESS_LOG_SAMPLE_RATE
+
+
+def log_access(req: Request, response: Response, endpoint: str, duration: float) -> None:
+    """Emit one JSON access record using a duration measured by the caller."""
+    if not access_logger.isEnabledFor(logging.INFO):
+        return
+    if not should_log_access(response.status_code, duration):
+        return
+
+    access_logger.info(
+        "request completed",
+        extra={
+            "client_ip": req.remote_addr,
+            "method": req.method,
+            "path": req.path,
+            "endpoint": endpoint,
+            "query": req.query_string.decode("latin-1"),
+            "status_code": response.status_code,
+            "response_bytes": response.content_length or 0,
+            "request_time_us": int(duration * 1_000_000),
+            "user_agent": req.headers.get("User-Agent"),
+        },
+    )
@@ -0,0 +1,155 @@
+"""Admission control that sheds excess requests before they reach handlers."""
+
+from __future__ import annotations
+
+import os
+from threading import Lock
+from time import monotonic, perf_counter
+
+from flask import Response, g, jsonify, request
+from prometheus_client import Counter, Gauge
+
+try:
+    from .flask_instance import app
+    from .metrics import METRICS_REGISTRY, normalize_endpoint_label
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from flask_instance import app
+    from metrics import METRICS_REGISTRY, normalize_endpoint_label
+
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "0"))
+ADMISSION_MODE = os.getenv("ADMISSION_MODE", "static").lower()
+ADMISSION_MIN_CONCURRENCY = int(os.getenv("ADMISSION_MIN_CONCURRENCY", "1"))
+ADMISSION_TARGET_LATENCY_MS = float(os.getenv("ADMISSION_TARGET_LATENCY_MS", "250"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+EXEMPT_PATHS = frozenset({"/health", "/ready", "/metrics"})
+
+DECREASE_FACTOR = 0.9
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+DEVOPS_INFO_ADMISSION_LIMIT = Gauge(
+    "devops_info_admission_limit",
+    "Current admission concurrency limit (0 when admission control is off).",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_ADMISSION_SHED_TOTAL = Counter(
+    "devops_info_admission_shed_total",
+    "Requests rejected by admission control.",
+    ["endpoint"],
+    registry=METRICS_REGISTRY,
+)
+
+
+class AdmissionController:
+    """Concurrency limiter with an optional AIMD-adjusted limit.
+
+    In ``static`` mode the limit stays at ``max_limit``. In ``adaptive`` mode
+    every completed request nudges the limit up by ``1 / limit`` while latency
+    stays under the target, and a slow request cuts it by ``DECREASE_FACTOR``
+    (at most once per cooldown so one burst does not collapse the limit).
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        mode: str = "static",
+        min_limit: int = 1,
+        target_latency: float = 0.25,
+    ) -> None:
+        if mode not in ("static", "adaptive"):
+            raise ValueError("admission mode must be 'static' or 'adaptive'")
+        self.max_limit = max_limit
+        self.mode = mode
+        self.min_limit = max(1, min(min_limit, max_limit))
+        self.target_latency = target_latency
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._lock = Lock()
+        DEVOPS_INFO_ADMISSION_LIMIT.set(max_limit)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_limit > 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Reserve a slot if the in-flight count is below the current limit."""
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: float) -> None:
+        """Free a slot and, in adaptive mode, adjust the limit from ``latency``."""
+        with self._lock:
+            self._in_flight -= 1
+            if self.mode != "adaptive":
+                return
+
+            if latency <= self.target_latency:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            else:
+                now = monotonic()
+                if now - self._last_decrease < DECREASE_COOLDOWN_SECONDS:
+                    return
+                self._last_decrease = now
+                self._limit = max(float(self.min_limit), self._limit * DECREASE_FACTOR)
+            DEVOPS_INFO_ADMISSION_LIMIT.set(int(self._limit))
+
+
+ADMISSION_CONTROLLER = AdmissionController(
+    ADMISSION_MAX_CONCURRENCY,
+    mode=ADMISSION_MODE,
+    min_limit=ADMISSION_MIN_CONCURRENCY,
+    target_latency=ADMISSION_TARGET_LATENCY_MS / 1000,
+)
+
+
+def _shed_response() -> Response:
+    """Return a JSON 503 payload telling the client when to retry."""
+    response = jsonify(
+        {
+            "error": "Service Unavailable",
+            "message": "Server is overloaded, retry later",
+        }
+    )
+    response.status_code = 503
+    response.headers["Retry-After"] = str(ADMISSION_RETRY_AFTER_SECONDS)
+    return response
+
+
+def admit_request() -> Response | None:
+    """Reject the request with 503 when the concurrency limit is reached.
+
+    Called from the router's ``guard_request`` hook after rate limiting.
+    """
+    controller = ADMISSION_CONTROLLER
+    if not controller.enabled or request.path in EXEMPT_PATHS:
+        return None
+
+    if not controller.try_acquire():
+        DEVOPS_INFO_ADMISSION_SHED_TOTAL.labels(
+            endpoint=normalize_endpoint_label()
+        ).inc()
+        return _shed_response()
+
+    g.admission_controller = controller
+    g.admission_start_time = perf_counter()
+    return None
+
+
+@app.teardown_request
+def release_admission_slot(error: BaseException | None) -> None:  # noqa: ARG001
+    """Release the admission slot held by this request, if any."""
+    controller = g.pop("admission_controller", None)
+    if controller is None:
+        return
+    controller.release(perf_counter() - g.admission_start_time)
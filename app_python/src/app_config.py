@@ -0,0 +1,176 @@
+"""Hot-reloadable application config loaded from ``APP_CONFIG_PATH``."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Any, Mapping
+
+try:
+    from .flask_instance import logger
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from flask_instance import logger
+
+APP_CONFIG_PATH = Path(os.getenv("APP_CONFIG_PATH", "/config/config.json"))
+APP_CONFIG_RELOAD_INTERVAL = float(os.getenv("APP_CONFIG_RELOAD_INTERVAL", "5"))
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts and lists into read-only equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively turn read-only mappings and tuples back into JSON types."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of one version of the config file."""
+
+    application: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    feature_flags: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    settings: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    generation: int = 0
+
+    def flag(self, name: str, default: bool = False) -> bool:
+        """Return a feature flag as a bool, falling back to ``default``."""
+        value = self.feature_flags.get(name, default)
+        return value if isinstance(value, bool) else default
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot in the same shape as the config file."""
+        return {
+            "application": _thaw(self.application),
+            "featureFlags": _thaw(self.feature_flags),
+            "settings": _thaw(self.settings),
+            "generation": self.generation,
+        }
+
+
+def _file_identity(path: Path) -> tuple[int, int, int, int] | None:
+    """Return a cheap change fingerprint for ``path`` or ``None`` if missing.
+
+    ConfigMap volumes swap a ``..data`` symlink on update, so the inode of
+    the resolved file changes even when mtime granularity would hide it.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class ConfigStore:
+    """Serve the current config snapshot and reload it when the file changes.
+
+    Request handlers call :meth:`get`, which returns the cached snapshot and at
+    most once per ``interval`` seconds stats the file. The file is only read
+    and parsed when its identity changes, and the new snapshot replaces the
+    old one with a single reference assignment, so readers never observe a
+    partially loaded config.
+    """
+
+    def __init__(self, path: Path, interval: float = APP_CONFIG_RELOAD_INTERVAL) -> None:
+        self.path = path
+        self.interval = interval
+        self._lock = Lock()
+        self._identity: tuple[int, int, int, int] | None = None
+        self._next_check = 0.0
+        self._snapshot = ConfigSnapshot()
+
+    def get(self) -> ConfigSnapshot:
+        """Return the current snapshot, revalidating it if the interval elapsed."""
+        if monotonic() >= self._next_check:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the file if it changed and return whether the snapshot was swapped.
+
+        Concurrent callers do not wait: if another thread is already checking,
+        they keep serving the current snapshot.
+        """
+        if not self._lock.acquire(blocking=force):
+            return False
+        try:
+            self._next_check = monotonic() + self.interval
+            identity = _file_identity(self.path)
+            if identity == self._identity and not force:
+                return False
+
+            snapshot = self._load(identity)
+            # Remember the identity even for a broken file so it is not
+            # re-parsed (and re-logged) on every check until it changes again.
+            self._identity = identity
+            if snapshot is None:
+                return False
+            self._snapshot = snapshot
+            return True
+        finally:
+            self._lock.release()
+
+    def _load(self, identity: tuple[int, int, int, int] | None) -> ConfigSnapshot | None:
+        """Parse the file into a new snapshot, keeping the old one on errors."""
+        generation = self._snapshot.generation + 1
+        if identity is None:
+            if self._identity is not None:
+                logger.warning(
+                    "config file disappeared, using defaults",
+                    extra={"path": str(self.path)},
+                )
+            return ConfigSnapshot(generation=generation)
+
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as error:
+            logger.warning(
+                "failed to load config file, keeping previous config",
+                extra={"path": str(self.path), "error": str(error)},
+            )
+            return None
+        if not isinstance(raw, dict):
+            logger.warning(
+                "config file is not a JSON object, keeping previous config",
+                extra={"path": str(self.path)},
+            )
+            return None
+
+        snapshot = ConfigSnapshot(
+            application=_freeze(raw.get("application") or {}),
+            feature_flags=_freeze(raw.get("featureFlags") or {}),
+            settings=_freeze(raw.get("settings") or {}),
+            generation=generation,
+        )
+        logger.info(
+            "config loaded",
+            extra={
+                "event": "config_reload",
+                "path": str(self.path),
+                "generation": generation,
+                "feature_flags": _thaw(snapshot.feature_flags),
+            },
+        )
+        return snapshot
+
+
+CONFIG_STORE = ConfigStore(APP_CONFIG_PATH)
+
+
+def get_config() -> ConfigSnapshot:
+    """Return the current application config snapshot."""
+    return CONFIG_STORE.get()
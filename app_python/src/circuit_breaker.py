@@ -0,0 +1,207 @@
+"""Deadline-bounded calls guarded by a circuit breaker."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from time import monotonic
+from typing import TypeVar
+
+from prometheus_client import Counter, Gauge
+
+try:
+    from .flask_instance import logger
+    from .metrics import METRICS_REGISTRY
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from flask_instance import logger
+    from metrics import METRICS_REGISTRY
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+DEVOPS_INFO_CIRCUIT_BREAKER_STATE = Gauge(
+    "devops_info_circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    ["breaker"],
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_CIRCUIT_BREAKER_FAILURES_TOTAL = Counter(
+    "devops_info_circuit_breaker_failures_total",
+    "Guarded calls that failed or missed their deadline.",
+    ["breaker", "reason"],
+    registry=METRICS_REGISTRY,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling through while the breaker is open."""
+
+
+class _DaemonWorkers:
+    """Run submitted calls on daemon threads, returning ``Future`` objects.
+
+    ``ThreadPoolExecutor`` joins its threads at interpreter exit, so a call
+    stuck on a hung volume would keep the process alive; these threads are
+    simply abandoned instead.
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        self._queue: SimpleQueue = SimpleQueue()
+        self._threads = [
+            Thread(target=self._run, name=f"{name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func: Callable[..., T], *args) -> Future:
+        future: Future = Future()
+        self._queue.put((future, func, args))
+        return future
+
+    def shutdown(self) -> None:
+        """Cancel queued calls and stop idle threads; a stuck call is left running."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, func, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as error:
+                future.set_exception(error)
+
+
+class CircuitBreaker:
+    """Run calls on a dedicated thread with a deadline and trip on repeated failures.
+
+    ``failure_threshold`` consecutive errors or timeouts open the breaker.
+    After ``reset_timeout`` seconds a single probe call is let through
+    (half-open); its success closes the breaker and its failure reopens it.
+    Calls run one at a time in submission order, so a call that outlives its
+    deadline can never be overtaken by a later one. Read-only calls that
+    need no ordering can pass ``ordered=False`` to run on a separate pool of
+    ``read_workers`` threads instead of queueing behind writes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        call_timeout: float,
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = monotonic,
+        read_workers: int = 2,
+    ) -> None:
+        self.name = name
+        self.call_timeout = call_timeout
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._writer = _DaemonWorkers(name, 1)
+        self._readers = _DaemonWorkers(f"{name}-read", max(1, read_workers))
+        self._lock = Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        DEVOPS_INFO_CIRCUIT_BREAKER_STATE.labels(breaker=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def call(
+        self,
+        func: Callable[..., T],
+        *args,
+        timeout: float | None = None,
+        ordered: bool = True,
+    ) -> T:
+        """Return ``func(*args)`` or raise its error, ``TimeoutError`` or ``CircuitOpenError``.
+
+        ``timeout`` overrides ``call_timeout`` for this call.
+        """
+        self._before_call()
+        deadline = self.call_timeout if timeout is None else timeout
+        workers = self._writer if ordered else self._readers
+        future = workers.submit(func, *args)
+        try:
+            result = future.result(timeout=deadline)
+        except Exception:
+            timed_out = not future.done()
+            future.cancel()
+            self._record_failure("timeout" if timed_out else "error")
+            if timed_out:
+                raise TimeoutError(f"{self.name} call exceeded {deadline:g}s") from None
+            raise
+        self._record_success()
+        return result
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._set_state(CLOSED)
+
+    def shutdown(self) -> None:
+        """Stop the call threads without waiting for a stuck call."""
+        self._writer.shutdown()
+        self._readers.shutdown()
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"{self.name} circuit is open")
+                self._set_state(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"{self.name} circuit is half-open")
+                self._probe_in_flight = True
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._set_state(CLOSED)
+
+    def _record_failure(self, reason: str) -> None:
+        DEVOPS_INFO_CIRCUIT_BREAKER_FAILURES_TOTAL.labels(breaker=self.name, reason=reason).inc()
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        """Must be called with ``_lock`` held."""
+        if state == self._state:
+            return
+        logger.warning(
+            "circuit breaker state changed",
+            extra={"breaker": self.name, "from_state": self._state, "to_state": state},
+        )
+        self._state = state
+        DEVOPS_INFO_CIRCUIT_BREAKER_STATE.labels(breaker=self.name).set(_STATE_VALUES[state])
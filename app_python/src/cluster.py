@@ -0,0 +1,276 @@
+"""Cluster-wide view built by querying peer replicas concurrently."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+import os
+import socket
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .latency_stats import LogHistogram
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from latency_stats import LogHistogram
+
+# Comma-separated peer base URLs, e.g. "http://10.0.0.7:5000,http://10.0.0.8:5000".
+CLUSTER_PEERS = os.getenv("CLUSTER_PEERS", "")
+# Headless Service name whose A/AAAA records are the peer pod IPs.
+CLUSTER_PEERS_DNS = os.getenv("CLUSTER_PEERS_DNS", "")
+CLUSTER_PEER_PORT = int(os.getenv("CLUSTER_PEER_PORT", os.getenv("PORT", "5000")))
+CLUSTER_PEER_TIMEOUT_SECONDS = float(os.getenv("CLUSTER_PEER_TIMEOUT_MS", "1000")) / 1000
+CLUSTER_CACHE_SECONDS = float(os.getenv("CLUSTER_CACHE_SECONDS", "2"))
+CLUSTER_MAX_CONNECTIONS = int(os.getenv("CLUSTER_MAX_CONNECTIONS", "16"))
+# This pod's address, so discovery does not query the local replica over HTTP.
+POD_IP = os.getenv("POD_IP", "")
+
+LOCAL_MEMBER = "local"
+PEER_PATHS = {
+    "visits": "/visits",
+    "health": "/health",
+    "stats": "/stats?format=sketch",
+}
+
+
+def parse_peer_urls(raw: str) -> list[str]:
+    """Return base URLs from a comma-separated list, without trailing slashes."""
+    return [url.strip().rstrip("/") for url in raw.split(",") if url.strip()]
+
+
+def resolve_peer_urls(
+    dns_name: str,
+    port: int,
+    resolver: Callable[..., list] = socket.getaddrinfo,
+) -> list[str]:
+    """Return one base URL per address behind ``dns_name`` (empty if unresolvable)."""
+    try:
+        records = resolver(dns_name, port, type=socket.SOCK_STREAM)
+    except OSError:
+        return []
+    urls = set()
+    for family, _, _, _, sockaddr in records:
+        host = f"[{sockaddr[0]}]" if family == socket.AF_INET6 else sockaddr[0]
+        urls.add(f"http://{host}:{port}")
+    return sorted(urls)
+
+
+class ClusterView:
+    """Fan requests out to every peer and merge the answers with local data.
+
+    All peer calls share one ``requests.Session`` whose connection pool keeps
+    connections alive between refreshes, and run concurrently on a thread
+    pool that grows so every call of a fan-out starts at once. ``timeout``
+    bounds the DNS lookup, each HTTP request and the whole fan-out, so one
+    stuck peer or resolver cannot delay the response for long. Merged
+    results are cached for ``cache_seconds`` and concurrent callers share a
+    refresh.
+    """
+
+    def __init__(
+        self,
+        static_peers: list[str],
+        dns_name: str = "",
+        port: int = CLUSTER_PEER_PORT,
+        timeout: float = CLUSTER_PEER_TIMEOUT_SECONDS,
+        cache_seconds: float = CLUSTER_CACHE_SECONDS,
+        max_connections: int = CLUSTER_MAX_CONNECTIONS,
+        local_addresses: frozenset[str] = frozenset(),
+        resolver: Callable[..., list] = socket.getaddrinfo,
+    ) -> None:
+        self.static_peers = static_peers
+        self.dns_name = dns_name
+        self.port = port
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self.local_addresses = local_addresses
+        self.max_connections = max_connections
+        self._resolver = resolver
+        self._session = requests.Session()
+        self._mount_adapter(max_connections)
+        self._workers = max_connections
+        self._executor = ThreadPoolExecutor(max_connections, thread_name_prefix="cluster-peer")
+        self._lock = Lock()
+        self._cached: dict[str, Any] | None = None
+        self._cached_at = 0.0
+        self._discovered: list[str] = []
+
+    def peers(self) -> list[str]:
+        """Return configured and discovered peers, excluding this replica.
+
+        The DNS lookup runs on the thread pool under ``timeout``; when it
+        times out the peers found by the previous lookup are used.
+        """
+        peers = set(self.static_peers)
+        if self.dns_name:
+            future = self._executor.submit(
+                resolve_peer_urls, self.dns_name, self.port, self._resolver
+            )
+            try:
+                self._discovered = future.result(timeout=self.timeout)
+            except TimeoutError:
+                future.cancel()
+            peers.update(self._discovered)
+        return sorted(peer for peer in peers if not self._is_local(peer))
+
+    def snapshot(self, local: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """Return the merged view, refreshing it when the cache has expired."""
+        cached = self._cached
+        if cached is not None and monotonic() - self._cached_at < self.cache_seconds:
+            return {**cached, "cached": True}
+
+        with self._lock:
+            if self._cached is not None and monotonic() - self._cached_at < self.cache_seconds:
+                return {**self._cached, "cached": True}
+            result = self._collect(local)
+            self._cached = result
+            self._cached_at = monotonic()
+            return {**result, "cached": False}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    def _mount_adapter(self, pool_connections: int) -> None:
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=self.max_connections
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _ensure_capacity(self, peers: int) -> None:
+        """Grow the thread pool and per-host pools so no peer call waits in a queue.
+
+        Must be called with ``_lock`` held.
+        """
+        calls = peers * len(PEER_PATHS)
+        if calls <= self._workers:
+            return
+        previous = self._executor
+        self._executor = ThreadPoolExecutor(calls, thread_name_prefix="cluster-peer")
+        self._workers = calls
+        previous.shutdown(wait=False)
+        if peers > self.max_connections:
+            self._mount_adapter(peers)
+
+    def _is_local(self, peer: str) -> bool:
+        parts = urlsplit(peer)
+        return parts.hostname in self.local_addresses and (parts.port or 80) == self.port
+
+    def _fetch(self, url: str) -> tuple[Any, float]:
+        started = perf_counter()
+        response = self._session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json(), perf_counter() - started
+
+    def _collect(self, local: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        peers = self.peers()
+        self._ensure_capacity(len(peers))
+        futures: dict[tuple[str, str], Future] = {
+            (peer, name): self._executor.submit(self._fetch, f"{peer}{path}")
+            for peer in peers
+            for name, path in PEER_PATHS.items()
+        }
+        wait(futures.values(), timeout=self.timeout)
+
+        members: dict[str, dict[str, Any]] = {
+            LOCAL_MEMBER: {"member": LOCAL_MEMBER, "errors": {}, "latency_ms": 0.0, **local()}
+        }
+        for (peer, name), future in futures.items():
+            member = members.setdefault(peer, {"member": peer, "errors": {}, "latency_ms": 0.0})
+            if not future.done():
+                future.cancel()
+                member["errors"][name] = "timed out"
+                member[name] = None
+                continue
+            try:
+                payload, elapsed = future.result()
+            except (requests.RequestException, ValueError) as error:
+                member["errors"][name] = f"{type(error).__name__}: {error}"
+                member[name] = None
+                continue
+            member["latency_ms"] = max(member["latency_ms"], round(elapsed * 1000, 3))
+            member[name] = payload
+
+        return _merge_members(list(members.values()))
+
+
+def _merge_members(members: list[dict[str, Any]]) -> dict[str, Any]:
+    """Turn raw per-member payloads into the merged cluster response."""
+    visits: list[int] = []
+    healthy = 0
+    merged_stats: dict[str, dict[str, LogHistogram]] = {}
+    for member in members:
+        visits_payload = member.get("visits")
+        member["visits"] = (
+            visits_payload.get("visits") if isinstance(visits_payload, dict) else None
+        )
+        if isinstance(member["visits"], int):
+            visits.append(member["visits"])
+
+        health_payload = member.get("health")
+        member["health"] = (
+            health_payload.get("status") if isinstance(health_payload, dict) else None
+        )
+        healthy += member["health"] == "healthy"
+
+        stats_payload = member.pop("stats", None)
+        if stats_payload:
+            try:
+                _merge_stats(merged_stats, stats_payload)
+            except (AttributeError, KeyError, TypeError, ValueError) as error:
+                member["errors"]["stats"] = f"{type(error).__name__}: {error}"
+        member["ok"] = not member["errors"]
+
+    return {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "members": members,
+        "summary": {
+            "members": len(members),
+            "reachable": sum(member["ok"] for member in members),
+            "healthy": healthy,
+            # Replicas sharing one visits volume report the same counter, so
+            # "max" is the total there; with per-pod volumes "sum" is.
+            "visits_max": max(visits, default=None),
+            "visits_sum": sum(visits),
+        },
+        "stats": {
+            endpoint: {name: histogram.summary() for name, histogram in windows.items()}
+            for endpoint, windows in sorted(merged_stats.items())
+        },
+    }
+
+
+def _merge_stats(merged: dict[str, dict[str, LogHistogram]], payload: dict[str, Any]) -> None:
+    """Add one member's ``/stats?format=sketch`` payload into ``merged``."""
+    histograms = {
+        endpoint: {name: LogHistogram.from_dict(sketch) for name, sketch in windows.items()}
+        for endpoint, windows in payload["endpoints"].items()
+    }
+    for endpoint, windows in histograms.items():
+        target = merged.setdefault(endpoint, {})
+        for name, histogram in windows.items():
+            if name in target:
+                target[name].merge(histogram)
+            else:
+                target[name] = histogram
+
+
+def _local_addresses() -> frozenset[str]:
+    addresses = {"127.0.0.1", "localhost", "::1"}
+    if POD_IP:
+        addresses.add(POD_IP)
+    return frozenset(addresses)
+
+
+CLUSTER_VIEW = ClusterView(
+    parse_peer_urls(CLUSTER_PEERS),
+    dns_name=CLUSTER_PEERS_DNS,
+    local_addresses=_local_addresses(),
+)
@@ -0,0 +1,157 @@
+"""Bounded-memory top-K tracking of client IPs and user agents."""
+
+from __future__ import annotations
+
+import os
+from threading import Lock
+
+from flask import request
+
+try:
+    from .admission import EXEMPT_PATHS
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from admission import EXEMPT_PATHS
+
+HEAVY_HITTERS_CAPACITY = int(os.getenv("HEAVY_HITTERS_CAPACITY", "100"))
+MAX_KEY_LENGTH = 256
+
+
+class _CountBucket:
+    """All monitored keys sharing one count, linked in ascending count order."""
+
+    __slots__ = ("count", "keys", "prev", "next")
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.keys: dict[str, None] = {}
+        self.prev: _CountBucket | None = None
+        self.next: _CountBucket | None = None
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitters sketch over a stream-summary structure.
+
+    At most ``capacity`` keys are monitored. Every update is O(1): a key moves
+    to the neighbouring count bucket, and an unseen key replaces one from the
+    minimum bucket, inheriting its count as the overestimation ``error``. Any
+    key with true frequency above ``total / capacity`` is guaranteed to be
+    monitored.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self._buckets: dict[str, _CountBucket] = {}
+        self._errors: dict[str, int] = {}
+        self._head: _CountBucket | None = None
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def add(self, key: str) -> None:
+        """Count one occurrence of ``key``."""
+        with self._lock:
+            self.total += 1
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                self._increment(key, bucket)
+                return
+
+            if len(self._buckets) < self.capacity:
+                self._errors[key] = 0
+                self._attach(key, self._bucket_after(None, 1))
+                return
+
+            head = self._head
+            evicted = next(iter(head.keys))
+            del self._errors[evicted]
+            del self._buckets[evicted]
+            head.keys[key] = None
+            del head.keys[evicted]
+            self._buckets[key] = head
+            self._errors[key] = head.count
+            self._increment(key, head)
+
+    def top(self, limit: int) -> list[dict[str, str | int]]:
+        """Return up to ``limit`` keys with the highest estimated counts."""
+        with self._lock:
+            tail = self._head
+            while tail is not None and tail.next is not None:
+                tail = tail.next
+
+            result: list[dict[str, str | int]] = []
+            bucket = tail
+            while bucket is not None and len(result) < limit:
+                for key in bucket.keys:
+                    result.append(
+                        {"value": key, "count": bucket.count, "error": self._errors[key]}
+                    )
+                    if len(result) == limit:
+                        break
+                bucket = bucket.prev
+            return result
+
+    def _increment(self, key: str, bucket: _CountBucket) -> None:
+        target = self._bucket_after(bucket, bucket.count + 1)
+        del bucket.keys[key]
+        self._attach(key, target)
+        if not bucket.keys:
+            self._unlink(bucket)
+
+    def _attach(self, key: str, bucket: _CountBucket) -> None:
+        bucket.keys[key] = None
+        self._buckets[key] = bucket
+
+    def _bucket_after(self, bucket: _CountBucket | None, count: int) -> _CountBucket:
+        """Return the bucket for ``count`` right after ``bucket`` (or the head)."""
+        following = self._head if bucket is None else bucket.next
+        if following is not None and following.count == count:
+            return following
+
+        created = _CountBucket(count)
+        created.prev = bucket
+        created.next = following
+        if following is not None:
+            following.prev = created
+        if bucket is None:
+            self._head = created
+        else:
+            bucket.next = created
+        return created
+
+    def _unlink(self, bucket: _CountBucket) -> None:
+        if bucket.prev is None:
+            self._head = bucket.next
+        else:
+            bucket.prev.next = bucket.next
+        if bucket.next is not None:
+            bucket.next.prev = bucket.prev
+
+
+CLIENT_IPS = SpaceSaving(HEAVY_HITTERS_CAPACITY)
+USER_AGENTS = SpaceSaving(HEAVY_HITTERS_CAPACITY)
+
+
+def get_top_clients(limit: int) -> dict[str, int | list[dict[str, str | int]]]:
+    """Return the heaviest client IPs and user agents seen by this worker."""
+    return {
+        "observed_requests": CLIENT_IPS.total,
+        "capacity": CLIENT_IPS.capacity,
+        "client_ip": CLIENT_IPS.top(limit),
+        "user_agent": USER_AGENTS.top(limit),
+    }
+
+
+def track_heavy_hitters() -> None:
+    """Feed the client IP and user agent of each non-probe request into the sketches.
+
+    Called from the router's ``guard_request`` hook ahead of rate limiting
+    and admission control, so rejected requests are counted too.
+    """
+    if request.path in EXEMPT_PATHS:
+        return
+    CLIENT_IPS.add(request.remote_addr or "unknown")
+    USER_AGENTS.add((request.headers.get("User-Agent") or "")[:MAX_KEY_LENGTH])
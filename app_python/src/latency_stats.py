@@ -0,0 +1,201 @@
+"""Mergeable per-endpoint latency quantile sketches over sliding windows."""
+
+from __future__ import annotations
+
+from array import array
+from math import ceil, log
+from threading import Lock
+from time import time
+from typing import Any
+
+RELATIVE_ACCURACY = 0.02
+MIN_TRACKED_SECONDS = 1e-6
+MAX_TRACKED_SECONDS = 100.0
+WINDOWS_MINUTES = (1, 5, 15)
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = log(_GAMMA)
+_BUCKETS = ceil(log(MAX_TRACKED_SECONDS / MIN_TRACKED_SECONDS) / _LOG_GAMMA) + 1
+_MAX_BUCKET_COUNT = 2**32 - 1
+
+
+class LogHistogram:
+    """Log-bucketed latency histogram (DDSketch-style) with fixed memory.
+
+    Bucket ``i`` holds values in ``(MIN * gamma**(i-1), MIN * gamma**i]`` so
+    every quantile estimate is within ``RELATIVE_ACCURACY`` of a real sample
+    inside the tracked range. Two histograms merge by adding their bucket
+    counts, which is what makes results combinable across workers and pods.
+    """
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self) -> None:
+        self.counts = array("I", bytes(4 * _BUCKETS))
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """Record one latency observation in seconds."""
+        if value <= MIN_TRACKED_SECONDS:
+            index = 0
+        else:
+            index = min(
+                _BUCKETS - 1, ceil(log(value / MIN_TRACKED_SECONDS) / _LOG_GAMMA)
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: LogHistogram) -> None:
+        """Add another histogram's observations into this one."""
+        counts = self.counts
+        for index, value in enumerate(other.counts):
+            if value:
+                counts[index] += value
+        self.count += other.count
+        self.total += other.total
+
+    def clear(self) -> None:
+        self.counts = array("I", bytes(4 * _BUCKETS))
+        self.count = 0
+        self.total = 0.0
+
+    def quantile(self, q: float) -> float | None:
+        """Return the estimated ``q`` quantile, or ``None`` when empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if seen > rank:
+                return MIN_TRACKED_SECONDS * _GAMMA**index * 2 / (1 + _GAMMA)
+        return MAX_TRACKED_SECONDS  # pragma: no cover - rank < count always hits
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return count, mean and the standard quantiles in seconds."""
+        result: dict[str, float | int | None] = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+        }
+        for name, q in QUANTILES:
+            result[name] = self.quantile(q)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize sparsely so peers can rebuild and merge the histogram."""
+        return {
+            "relative_accuracy": RELATIVE_ACCURACY,
+            "min_seconds": MIN_TRACKED_SECONDS,
+            "max_seconds": MAX_TRACKED_SECONDS,
+            "count": self.count,
+            "sum": self.total,
+            "buckets": [[index, value] for index, value in enumerate(self.counts) if value],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> LogHistogram:
+        """Rebuild a histogram produced by :meth:`to_dict` with the same layout.
+
+        Payloads come from peers, so anything that does not fit this layout
+        (foreign bucket indexes, negative or overflowing counts, a count that
+        disagrees with the buckets) raises ``ValueError``.
+        """
+        if (
+            payload.get("relative_accuracy") != RELATIVE_ACCURACY
+            or payload.get("min_seconds") != MIN_TRACKED_SECONDS
+            or payload.get("max_seconds", MAX_TRACKED_SECONDS) != MAX_TRACKED_SECONDS
+        ):
+            raise ValueError("incompatible latency sketch layout")
+        histogram = cls()
+        counts = histogram.counts
+        for index, value in payload["buckets"]:
+            index, value = int(index), int(value)
+            if not 0 <= index < _BUCKETS:
+                raise ValueError(f"latency sketch bucket {index} out of range")
+            if not 0 <= counts[index] + value <= _MAX_BUCKET_COUNT:
+                raise ValueError(f"latency sketch bucket {index} count out of range")
+            counts[index] += value
+        histogram.count = int(payload["count"])
+        histogram.total = float(payload["sum"])
+        if histogram.count != sum(counts) or not histogram.total >= 0:
+            raise ValueError("latency sketch totals do not match its buckets")
+        return histogram
+
+
+class WindowedLatency:
+    """Per-minute histograms for the last ``max(WINDOWS_MINUTES)`` minutes.
+
+    Windows are aligned to minute boundaries: the 5 minute window is the
+    current (partial) minute plus the four before it.
+    """
+
+    def __init__(self, minutes: int = max(WINDOWS_MINUTES)) -> None:
+        self.slots = [LogHistogram() for _ in range(minutes)]
+        self.slot_minutes = [-1] * minutes
+        self._lock = Lock()
+
+    def record(self, value: float, now: float) -> None:
+        minute = int(now // 60)
+        index = minute % len(self.slots)
+        with self._lock:
+            if self.slot_minutes[index] != minute:
+                self.slot_minutes[index] = minute
+                self.slots[index].clear()
+            self.slots[index].add(value)
+
+    def window(self, minutes: int, now: float) -> LogHistogram:
+        """Return a merged histogram for the last ``minutes`` minutes."""
+        current = int(now // 60)
+        merged = LogHistogram()
+        with self._lock:
+            for slot, slot_minute in zip(self.slots, self.slot_minutes):
+                if current - minutes < slot_minute <= current:
+                    merged.merge(slot)
+        return merged
+
+
+class LatencyStats:
+    """Registry of windowed latency sketches keyed by endpoint label."""
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, WindowedLatency] = {}
+        self._lock = Lock()
+
+    def record(self, endpoint: str, value: float, now: float | None = None) -> None:
+        windowed = self._endpoints.get(endpoint)
+        if windowed is None:
+            with self._lock:
+                windowed = self._endpoints.setdefault(endpoint, WindowedLatency())
+        windowed.record(value, time() if now is None else now)
+
+    def windows(self, now: float | None = None) -> dict[str, dict[str, LogHistogram]]:
+        """Return ``{endpoint: {"1m": histogram, ...}}`` for every window."""
+        now = time() if now is None else now
+        with self._lock:
+            endpoints = dict(self._endpoints)
+        return {
+            endpoint: {
+                f"{minutes}m": windowed.window(minutes, now) for minutes in WINDOWS_MINUTES
+            }
+            for endpoint, windowed in sorted(endpoints.items())
+        }
+
+    def snapshot(self, sketches: bool = False, now: float | None = None) -> dict[str, Any]:
+        """Return quantile summaries, or raw mergeable sketches, per endpoint."""
+        return {
+            "relative_accuracy": RELATIVE_ACCURACY,
+            "unit": "seconds",
+            "endpoints": {
+                endpoint: {
+                    name: histogram.to_dict() if sketches else histogram.summary()
+                    for name, histogram in windows.items()
+                }
+                for endpoint, windows in self.windows(now).items()
+            },
+        }
+
+
+LATENCY_STATS = LatencyStats()
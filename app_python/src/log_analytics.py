@@ -0,0 +1,384 @@
+"""Offline analytics for the service's JSON access logs.
+
+Streams one or more log files (plain or ``.gz``) in constant memory and
+reports per-path latency percentiles, error rates, the most frequent 404
+paths and time rollups, as JSON or CSV. Large plain files are split into
+line-aligned byte ranges so every core can work on them::
+
+    poetry run python -m src.log_analytics logs/*.log --format csv --section paths
+
+Only access records are counted: lines from the app's access logger or the
+gunicorn access format, i.e. JSON objects with ``path``, ``status_code`` and
+``request_time_us``. Other lines are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from datetime import datetime, timezone
+import gzip
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Any, BinaryIO, TextIO
+
+try:
+    from .latency_stats import LogHistogram
+except ImportError:  # pragma: no cover - allows `python src/log_analytics.py`
+    from latency_stats import LogHistogram
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+DEFAULT_ROLLUP_SECONDS = 60
+DEFAULT_MAX_PATHS = 1000
+DEFAULT_MAX_ROLLUPS = 1440
+DEFAULT_TOP = 10
+OVERFLOW_PATH = "other"
+SECTIONS = ("paths", "rollups", "not_found")
+_PERCENTILES = (("p50_ms", 0.5), ("p90_ms", 0.9), ("p99_ms", 0.99))
+
+
+class RequestStats:
+    """Request, error and latency totals for one path or time bucket."""
+
+    __slots__ = ("requests", "client_errors", "server_errors", "latency")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.client_errors = 0
+        self.server_errors = 0
+        self.latency = LogHistogram()
+
+    def add(self, status_code: int, seconds: float) -> None:
+        self.requests += 1
+        if status_code >= 500:
+            self.server_errors += 1
+        elif status_code >= 400:
+            self.client_errors += 1
+        self.latency.add(seconds)
+
+    def merge(self, other: RequestStats) -> None:
+        self.requests += other.requests
+        self.client_errors += other.client_errors
+        self.server_errors += other.server_errors
+        self.latency.merge(other.latency)
+
+    def report(self) -> dict[str, Any]:
+        row: dict[str, Any] = {
+            "requests": self.requests,
+            "client_errors": self.client_errors,
+            "server_errors": self.server_errors,
+            "error_rate": round(self.server_errors / self.requests, 6) if self.requests else 0.0,
+        }
+        for name, q in _PERCENTILES:
+            value = self.latency.quantile(q)
+            row[name] = None if value is None else round(value * 1000, 3)
+        return row
+
+
+class LogSummary:
+    """Mergeable aggregate of the access records in one or more log chunks.
+
+    Memory is bounded: at most ``max_paths`` paths get their own stats (the
+    rest share ``other``), 404 counts are pruned back to the ``max_paths``
+    most frequent whenever they reach twice that (so the top list is
+    approximate for very diverse scans), and rollups hold one fixed-size
+    histogram per time bucket for at most ``max_rollups`` buckets. Past that
+    the bucket width doubles and neighbouring buckets are merged, so long
+    time spans get coarser rollups rather than more memory.
+    """
+
+    def __init__(
+        self,
+        rollup_seconds: int = DEFAULT_ROLLUP_SECONDS,
+        max_paths: int = DEFAULT_MAX_PATHS,
+        top: int = DEFAULT_TOP,
+        max_rollups: int = DEFAULT_MAX_ROLLUPS,
+    ) -> None:
+        self.rollup_seconds = rollup_seconds
+        self.max_paths = max_paths
+        self.top = top
+        self.max_rollups = max_rollups
+        self.lines = 0
+        self.skipped = 0
+        self.total = RequestStats()
+        self.paths: dict[str, RequestStats] = {}
+        self.rollups: dict[int, RequestStats] = {}
+        self.not_found: Counter[str] = Counter()
+        self._timestamp_cache: tuple[str, int | None] = ("", None)
+
+    def add_line(self, line: bytes) -> None:
+        """Parse one log line and count it if it is an access record."""
+        self.lines += 1
+        try:
+            record = json.loads(line)
+            path = record["path"]
+            status_code = int(record["status_code"])
+            seconds = int(record["request_time_us"]) / 1_000_000
+        except (ValueError, TypeError, KeyError):
+            self.skipped += 1
+            return
+        if not isinstance(path, str):
+            self.skipped += 1
+            return
+        self.add(path, status_code, seconds, record.get("timestamp"))
+
+    def add(self, path: str, status_code: int, seconds: float, timestamp: Any = None) -> None:
+        self.total.add(status_code, seconds)
+        self._path_stats(path).add(status_code, seconds)
+        if status_code == 404:
+            self.not_found[path] += 1
+            if len(self.not_found) > 2 * self.max_paths:
+                self._prune_not_found()
+
+        bucket = self._rollup_bucket(timestamp)
+        if bucket is not None:
+            stats = self.rollups.get(bucket)
+            if stats is None:
+                stats = self.rollups[bucket] = RequestStats()
+            stats.add(status_code, seconds)
+            if len(self.rollups) > self.max_rollups:
+                self._coarsen_rollups()
+
+    def merge(self, other: LogSummary) -> None:
+        """Add another summary, built with the same settings, into this one."""
+        self.lines += other.lines
+        self.skipped += other.skipped
+        self.total.merge(other.total)
+        for path, stats in other.paths.items():
+            self._path_stats(path).merge(stats)
+        while self.rollup_seconds < other.rollup_seconds:
+            self._coarsen_rollups()
+        for bucket, stats in other.rollups.items():
+            bucket -= bucket % self.rollup_seconds
+            self.rollups.setdefault(bucket, RequestStats()).merge(stats)
+        if len(self.rollups) > self.max_rollups:
+            self._coarsen_rollups()
+        self.not_found.update(other.not_found)
+        if len(self.not_found) > 2 * self.max_paths:
+            self._prune_not_found()
+
+    def report(self) -> dict[str, Any]:
+        """Return the JSON-friendly report with one list per section."""
+        paths = sorted(self.paths.items(), key=lambda item: (-item[1].requests, item[0]))
+        return {
+            "lines": self.lines,
+            "skipped": self.skipped,
+            "rollup_seconds": self.rollup_seconds,
+            "total": self.total.report(),
+            "paths": [{"path": path, **stats.report()} for path, stats in paths],
+            "rollups": [
+                {
+                    "start": datetime.fromtimestamp(bucket, tz=timezone.utc).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    ),
+                    **stats.report(),
+                }
+                for bucket, stats in sorted(self.rollups.items())
+            ],
+            "not_found": [
+                {"path": path, "requests": count}
+                for path, count in self.not_found.most_common(self.top)
+            ],
+        }
+
+    def _path_stats(self, path: str) -> RequestStats:
+        stats = self.paths.get(path)
+        if stats is None:
+            if len(self.paths) >= self.max_paths:
+                path = OVERFLOW_PATH
+            stats = self.paths.setdefault(path, RequestStats())
+        return stats
+
+    def _coarsen_rollups(self) -> None:
+        """Double the rollup width until at most ``max_rollups`` buckets remain."""
+        while True:
+            self.rollup_seconds *= 2
+            coarse: dict[int, RequestStats] = {}
+            for bucket, stats in sorted(self.rollups.items()):
+                bucket -= bucket % self.rollup_seconds
+                target = coarse.get(bucket)
+                if target is None:
+                    coarse[bucket] = stats
+                else:
+                    target.merge(stats)
+            self.rollups = coarse
+            if len(coarse) <= self.max_rollups:
+                return
+
+    def _prune_not_found(self) -> None:
+        self.not_found = Counter(dict(self.not_found.most_common(self.max_paths)))
+
+    def _rollup_bucket(self, timestamp: Any) -> int | None:
+        if not isinstance(timestamp, str):
+            return None
+        cached_text, cached_epoch = self._timestamp_cache
+        if timestamp != cached_text:
+            cached_epoch = _parse_timestamp(timestamp)
+            self._timestamp_cache = (timestamp, cached_epoch)
+        if cached_epoch is None:
+            return None
+        return cached_epoch - cached_epoch % self.rollup_seconds
+
+
+def _parse_timestamp(value: str) -> int | None:
+    """Return epoch seconds for app (ISO 8601) or gunicorn (``[%d/%b/%Y:...]``) times."""
+    try:
+        if value.startswith("["):
+            parsed = datetime.strptime(value, "[%d/%b/%Y:%H:%M:%S %z]")
+        else:
+            parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def plan_chunks(paths: list[Path], chunk_bytes: int) -> list[tuple[Path, int, int | None]]:
+    """Split plain files into ``(path, start, end)`` byte ranges; ``.gz`` files stay whole."""
+    chunks: list[tuple[Path, int, int | None]] = []
+    for path in paths:
+        if path.suffix == ".gz":
+            chunks.append((path, 0, None))
+            continue
+        size = path.stat().st_size
+        start = 0
+        while True:
+            end = start + chunk_bytes
+            chunks.append((path, start, end if end < size else None))
+            if end >= size:
+                break
+            start = end
+    return chunks
+
+
+def _iter_chunk_lines(handle: BinaryIO, start: int, end: int | None):
+    """Yield the lines that begin inside ``[start, end)``.
+
+    A chunk skips the partial line it starts in; the previous chunk reads
+    past its end to finish that line, so every line is seen exactly once.
+    """
+    if start:
+        handle.seek(start - 1)
+        handle.readline()
+    position = handle.tell()
+    while end is None or position < end:
+        line = handle.readline()
+        if not line:
+            return
+        position += len(line)
+        if line.strip():
+            yield line
+
+
+def analyze_chunk(
+    chunk: tuple[Path, int, int | None],
+    rollup_seconds: int = DEFAULT_ROLLUP_SECONDS,
+    max_paths: int = DEFAULT_MAX_PATHS,
+    top: int = DEFAULT_TOP,
+    max_rollups: int = DEFAULT_MAX_ROLLUPS,
+) -> LogSummary:
+    """Summarize one byte range of a log file."""
+    path, start, end = chunk
+    summary = LogSummary(rollup_seconds, max_paths, top, max_rollups)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as handle:
+        for line in _iter_chunk_lines(handle, start, end):
+            summary.add_line(line)
+    return summary
+
+
+def analyze_files(
+    paths: list[Path],
+    workers: int | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    rollup_seconds: int = DEFAULT_ROLLUP_SECONDS,
+    max_paths: int = DEFAULT_MAX_PATHS,
+    top: int = DEFAULT_TOP,
+    max_rollups: int = DEFAULT_MAX_ROLLUPS,
+) -> LogSummary:
+    """Summarize ``paths``, spreading chunks over ``workers`` processes."""
+    chunks = plan_chunks(paths, chunk_bytes)
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    settings = (rollup_seconds, max_paths, top, max_rollups)
+    result = LogSummary(*settings)
+
+    if workers <= 1:
+        for chunk in chunks:
+            result.merge(analyze_chunk(chunk, *settings))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_chunk, chunk, *settings) for chunk in chunks]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+
+def write_csv(report: dict[str, Any], section: str, output: TextIO) -> None:
+    """Write one report section as CSV with a header row."""
+    rows = report[section]
+    fieldnames = list(rows[0]) if rows else ["path", "requests"]
+    writer = csv.DictWriter(output, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.log_analytics",
+        description="Summarize the service's JSON access logs.",
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="log files (.gz supported)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument(
+        "--section", choices=SECTIONS, default="paths", help="section to print as CSV"
+    )
+    parser.add_argument("--output", type=Path, help="write to a file instead of stdout")
+    parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    parser.add_argument(
+        "--chunk-mb", type=int, default=DEFAULT_CHUNK_BYTES // (1024 * 1024),
+        help="split plain files into chunks of this size",
+    )
+    parser.add_argument("--rollup-seconds", type=int, default=DEFAULT_ROLLUP_SECONDS)
+    parser.add_argument(
+        "--max-rollups", type=int, default=DEFAULT_MAX_ROLLUPS,
+        help="widen rollup buckets to keep at most this many",
+    )
+    parser.add_argument("--max-paths", type=int, default=DEFAULT_MAX_PATHS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="404 paths to report")
+    args = parser.parse_args(argv)
+
+    missing = [str(path) for path in args.files if not path.is_file()]
+    if missing:
+        parser.error(f"not a file: {', '.join(missing)}")
+
+    report = analyze_files(
+        args.files,
+        workers=args.workers,
+        chunk_bytes=max(1, args.chunk_mb) * 1024 * 1024,
+        rollup_seconds=max(1, args.rollup_seconds),
+        max_paths=max(1, args.max_paths),
+        top=max(1, args.top),
+        max_rollups=max(1, args.max_rollups),
+    ).report()
+
+    output = args.output.open("w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(report, args.section, output)
+        else:
+            json.dump(report, output, indent=2)
+            output.write("\n")
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
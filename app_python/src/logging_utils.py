@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime, timezone
+import gzip
 import json
 import logging
 import os
 import sys
-from typing import Any
+import threading
+import time
+from typing import Any, TextIO
+
+import requests
 
 _RESERVED_RECORD_FIELDS = frozenset(
     vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None)).keys()
@@ -53,21 +59,176 @@ def format(self, record: logging.LogRecord) -> str:
         return json.dumps(payload, separators=(",", ":"))
 
 
+class LokiHandler(logging.Handler):
+    """Batch formatted records in memory and push them to Loki.
+
+    Records are buffered and sent as one gzip-compressed JSON push when
+    ``batch_size`` records are queued or ``flush_interval`` seconds pass,
+    whichever comes first. A failed push is retried up to ``max_retries``
+    times with exponential backoff; if it still fails (or Loki rejects the
+    batch), the lines are written to ``fallback`` so they are never lost
+    silently. The buffer holds at most ``max_buffer`` records and drops the
+    oldest when Loki falls behind.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        labels: dict[str, str],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 5.0,
+        fallback: TextIO | None = None,
+    ) -> None:
+        super().__init__()
+        self.url = url
+        self.labels = labels
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.fallback = fallback if fallback is not None else sys.stdout
+        self.dropped = 0
+        self._buffer: deque[tuple[str, str]] = deque(maxlen=max_buffer)
+        self._wakeup = threading.Condition()
+        self._session = requests.Session()
+        self._worker: threading.Thread | None = None
+        self._worker_pid: int | None = None
+        self._closed = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record)
+        except Exception:  # pragma: no cover - mirrors logging.Handler behavior
+            self.handleError(record)
+            return
+
+        timestamp_ns = str(int(record.created * 1_000_000_000))
+        with self._wakeup:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append((timestamp_ns, line))
+            self._ensure_worker()
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.notify()
+
+    def flush(self) -> None:
+        """Push everything buffered right now, from the calling thread."""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._send(batch)
+
+    def close(self) -> None:
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        worker = self._worker
+        if worker is not None and worker.is_alive() and self._worker_pid == os.getpid():
+            worker.join(timeout=self.timeout * (self.max_retries + 1))
+        self.flush()
+        self._session.close()
+        super().close()
+
+    def _ensure_worker(self) -> None:
+        """Start the flush thread lazily, and again in forked worker processes."""
+        if self._worker_pid == os.getpid() or self._closed:
+            return
+        self._worker_pid = os.getpid()
+        self._worker = threading.Thread(
+            target=self._run, name="loki-log-shipper", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _take_batch(self) -> list[tuple[str, str]]:
+        with self._wakeup:
+            count = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _send(self, batch: list[tuple[str, str]]) -> None:
+        payload = {"streams": [{"stream": self.labels, "values": batch}]}
+        body = gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self._session.post(
+                    self.url, data=body, headers=headers, timeout=self.timeout
+                )
+            except requests.RequestException:
+                continue
+            if response.status_code < 300:
+                return
+            # Loki answers 4xx for batches it will never accept (bad labels,
+            # out-of-order or too-old entries); only 429 is worth retrying.
+            if response.status_code < 500 and response.status_code != 429:
+                break
+
+        self._write_fallback(batch)
+
+    def _write_fallback(self, batch: list[tuple[str, str]]) -> None:
+        try:
+            self.fallback.write("".join(f"{line}\n" for _, line in batch))
+            self.fallback.flush()
+        except (OSError, ValueError):  # pragma: no cover - closed stdout at exit
+            pass
+
+
+def parse_loki_labels(raw: str) -> dict[str, str]:
+    """Parse ``key=value`` pairs separated by commas into Loki stream labels."""
+    labels: dict[str, str] = {}
+    for item in raw.split(","):
+        key, separator, value = item.partition("=")
+        if separator and key.strip():
+            labels[key.strip()] = value.strip()
+    return labels
+
+
 def get_log_level() -> int:
     """Return the configured application log level."""
     raw_level = os.getenv("LOG_LEVEL", "INFO").upper()
     return getattr(logging, raw_level, logging.INFO)
 
 
+def create_log_handler() -> logging.Handler:
+    """Return a Loki push handler if ``LOKI_PUSH_URL`` is set, else stdout."""
+    loki_url = os.getenv("LOKI_PUSH_URL", "")
+    if loki_url:
+        handler: logging.Handler = LokiHandler(
+            loki_url,
+            labels=parse_loki_labels(os.getenv("LOKI_LABELS", "app=devops-python")),
+            batch_size=int(os.getenv("LOKI_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("LOKI_FLUSH_INTERVAL", "1.0")),
+        )
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JSONFormatter())
+    return handler
+
+
 def configure_json_logger(name: str) -> logging.Logger:
-    """Create a stdout logger that emits JSON records."""
+    """Create a logger that emits JSON records to stdout or Loki."""
     logger = logging.getLogger(name)
     logger.handlers.clear()
     logger.setLevel(get_log_level())
     logger.propagate = False
-
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JSONFormatter())
-    logger.addHandler(handler)
+    logger.addHandler(create_log_handler())
 
     return logger
@@ -0,0 +1,157 @@
+"""On-demand tracemalloc snapshots for diagnosing worker memory growth."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+import os
+from threading import Lock
+import tracemalloc
+from typing import Any
+
+MEMORY_DIAGNOSTICS_ENABLED = (
+    os.getenv("MEMORY_DIAGNOSTICS_ENABLED", "False").lower() == "true"
+)
+MAX_SNAPSHOTS = 8
+DEFAULT_TRACE_FRAMES = 1
+# tracemalloc rejects deeper tracebacks with ValueError.
+MAX_TRACE_FRAMES = 65535
+DEFAULT_TOP_LIMIT = 10
+GROUP_BY_CHOICES = ("lineno", "filename", "traceback")
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_LOCK = Lock()
+_SNAPSHOTS: OrderedDict[int, tuple[datetime, tracemalloc.Snapshot]] = OrderedDict()
+_next_snapshot_id = 1
+
+
+class SnapshotNotFoundError(LookupError):
+    """Raised when a snapshot id is unknown or has been evicted."""
+
+
+def get_tracing_status() -> dict[str, Any]:
+    """Return whether tracing is active plus current and peak traced memory."""
+    current, peak = tracemalloc.get_traced_memory()
+    with _LOCK:
+        snapshot_ids = list(_SNAPSHOTS)
+    return {
+        "tracing": tracemalloc.is_tracing(),
+        "frames": tracemalloc.get_traceback_limit(),
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "snapshots": snapshot_ids,
+    }
+
+
+def start_tracing(frames: int = DEFAULT_TRACE_FRAMES) -> dict[str, Any]:
+    """Start tracemalloc if it is not running yet, clamping ``frames`` to its range."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(min(max(1, frames), MAX_TRACE_FRAMES))
+    return get_tracing_status()
+
+
+def stop_tracing() -> dict[str, Any]:
+    """Stop tracemalloc and drop every stored snapshot."""
+    with _LOCK:
+        _SNAPSHOTS.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return get_tracing_status()
+
+
+def take_snapshot() -> int:
+    """Take a filtered snapshot, store it, and return its id.
+
+    The oldest snapshot is evicted once ``MAX_SNAPSHOTS`` are stored.
+    """
+    global _next_snapshot_id
+
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing")
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    with _LOCK:
+        snapshot_id = _next_snapshot_id
+        _next_snapshot_id += 1
+        _SNAPSHOTS[snapshot_id] = (datetime.now(timezone.utc), snapshot)
+        while len(_SNAPSHOTS) > MAX_SNAPSHOTS:
+            _SNAPSHOTS.popitem(last=False)
+    return snapshot_id
+
+
+def _get_snapshot(snapshot_id: int) -> tuple[datetime, tracemalloc.Snapshot]:
+    """Return a stored snapshot with its capture time."""
+    with _LOCK:
+        try:
+            return _SNAPSHOTS[snapshot_id]
+        except KeyError:
+            raise SnapshotNotFoundError(snapshot_id) from None
+
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> list[str]:
+    """Return traceback frames as ``file:line`` strings, most recent first."""
+    return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+
+def get_top_allocations(
+    snapshot_id: int,
+    limit: int = DEFAULT_TOP_LIMIT,
+    group_by: str = "lineno",
+) -> dict[str, Any]:
+    """Return the largest allocation sites in a stored snapshot."""
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY_CHOICES)}")
+
+    taken_at, snapshot = _get_snapshot(snapshot_id)
+    stats = snapshot.statistics(group_by)
+    return {
+        "snapshot": snapshot_id,
+        "taken_at": taken_at.isoformat(),
+        "group_by": group_by,
+        "total_bytes": sum(stat.size for stat in stats),
+        "top": [
+            {
+                "traceback": _format_traceback(stat.traceback),
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ],
+    }
+
+
+def get_allocation_diff(
+    from_id: int,
+    to_id: int,
+    limit: int = DEFAULT_TOP_LIMIT,
+    group_by: str = "lineno",
+) -> dict[str, Any]:
+    """Return allocation sites that grew or shrank the most between two snapshots."""
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY_CHOICES)}")
+
+    _, older = _get_snapshot(from_id)
+    _, newer = _get_snapshot(to_id)
+    stats = newer.compare_to(older, group_by)
+    return {
+        "from": from_id,
+        "to": to_id,
+        "group_by": group_by,
+        "size_diff_bytes": sum(stat.size_diff for stat in stats),
+        "top": [
+            {
+                "traceback": _format_traceback(stat.traceback),
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ],
+    }
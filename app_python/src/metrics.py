@@ -1,6 +1,10 @@
 """Prometheus metrics and Flask request instrumentation."""
 
+from http import HTTPStatus
+import os
+from threading import Lock
 from time import perf_counter
+import tracemalloc
 
 from flask import Response, g, request
 from prometheus_client import (
@@ -13,12 +17,21 @@
 )
 
 try:
+    from .access_log import log_access
     from .flask_instance import app
+    from .latency_stats import LATENCY_STATS
 except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from access_log import log_access
     from flask_instance import app
+    from latency_stats import LATENCY_STATS
 
 METRICS_REGISTRY = CollectorRegistry()
 
+ALLOWED_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+ALLOWED_STATUS_CODES = frozenset(str(status.value) for status in HTTPStatus)
+METRICS_MAX_SERIES_PER_METRIC = int(os.getenv("METRICS_MAX_SERIES_PER_METRIC", "500"))
+OVERFLOW_LABEL = "other"
+
 HTTP_REQUESTS_TOTAL = Counter(
     "http_requests_total",
     "Total HTTP requests handled by the service.",
@@ -48,6 +61,92 @@
     "Time spent collecting system information.",
     registry=METRICS_REGISTRY,
 )
+DEVOPS_INFO_VISITS_PENDING = Gauge(
+    "devops_info_visits_pending",
+    "Visits counted in memory while visits storage is unavailable.",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_VISITS_RECONCILED_TOTAL = Counter(
+    "devops_info_visits_reconciled_total",
+    "In-memory visits written back to storage after it recovered.",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_TRACEMALLOC_TRACED_BYTES = Gauge(
+    "devops_info_tracemalloc_traced_bytes",
+    "Memory currently traced by tracemalloc (0 when tracing is off).",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_TRACEMALLOC_PEAK_BYTES = Gauge(
+    "devops_info_tracemalloc_peak_bytes",
+    "Peak memory traced by tracemalloc since tracing started.",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_METRIC_LABELS_COLLAPSED_TOTAL = Counter(
+    "devops_info_metric_labels_collapsed_total",
+    "Observations recorded under the 'other' label instead of their own series.",
+    ["metric", "reason"],
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_TRACEMALLOC_TRACED_BYTES.set_function(
+    lambda: tracemalloc.get_traced_memory()[0]
+)
+DEVOPS_INFO_TRACEMALLOC_PEAK_BYTES.set_function(
+    lambda: tracemalloc.get_traced_memory()[1]
+)
+
+
+class LabelGuard:
+    """Keep request-derived label values bounded before they create series.
+
+    Methods and status codes outside the allow-lists become ``other``. Each
+    metric may also hold at most ``max_series`` distinct label sets; once full,
+    new combinations are recorded under a single all-``other`` series. Both
+    kinds of collapse are counted per metric.
+    """
+
+    def __init__(self, max_series: int = METRICS_MAX_SERIES_PER_METRIC) -> None:
+        self.max_series = max_series
+        self._series: dict[str, set[tuple[str, ...]]] = {}
+        self._lock = Lock()
+
+    def method(self, method: str, metric: str) -> str:
+        """Return ``method`` if allow-listed, otherwise ``other``."""
+        if method in ALLOWED_METHODS:
+            return method
+        DEVOPS_INFO_METRIC_LABELS_COLLAPSED_TOTAL.labels(
+            metric=metric, reason="not_allowed"
+        ).inc()
+        return OVERFLOW_LABEL
+
+    def labels(self, metric: str, labels: dict[str, str]) -> dict[str, str]:
+        """Return the label set ``metric`` should record this observation under."""
+        guarded = dict(labels)
+        if "method" in guarded:
+            guarded["method"] = self.method(guarded["method"], metric)
+        status_code = guarded.get("status_code")
+        if status_code is not None and status_code not in ALLOWED_STATUS_CODES:
+            guarded["status_code"] = OVERFLOW_LABEL
+            DEVOPS_INFO_METRIC_LABELS_COLLAPSED_TOTAL.labels(
+                metric=metric, reason="not_allowed"
+            ).inc()
+
+        key = tuple(guarded.values())
+        series = self._series.get(metric)
+        if series is not None and key in series:
+            return guarded
+        with self._lock:
+            series = self._series.setdefault(metric, set())
+            if key in series or len(series) < self.max_series:
+                series.add(key)
+                return guarded
+
+        DEVOPS_INFO_METRIC_LABELS_COLLAPSED_TOTAL.labels(
+            metric=metric, reason="series_limit"
+        ).inc()
+        return dict.fromkeys(guarded, OVERFLOW_LABEL)
+
+
+LABEL_GUARD = LabelGuard()
 
 
 def normalize_endpoint_label() -> str:
@@ -75,19 +174,20 @@ def generate_metrics_response() -> Response:
 def start_http_request_metrics() -> None:
     """Capture request start time and increase the in-flight gauge."""
     endpoint = normalize_endpoint_label()
-    g.metrics_method = request.method
+    method = LABEL_GUARD.method(request.method, "http_requests_in_progress")
+    g.metrics_method = method
     g.metrics_endpoint = endpoint
     g.metrics_start_time = perf_counter()
     g.metrics_in_progress = True
     HTTP_REQUESTS_IN_PROGRESS.labels(
-        method=request.method,
+        method=method,
         endpoint=endpoint,
     ).inc()
 
 
 @app.after_request
 def record_http_request_metrics(response: Response) -> Response:
-    """Persist request counter and latency observations."""
+    """Persist request counter, latency observations and the access log line."""
     method = getattr(g, "metrics_method", request.method)
     endpoint = getattr(g, "metrics_endpoint", normalize_endpoint_label())
     start_time = getattr(g, "metrics_start_time", None)
@@ -99,10 +199,15 @@ def record_http_request_metrics(response: Response) -> Response:
         "endpoint": endpoint,
         "status_code": str(response.status_code),
     }
-    HTTP_REQUESTS_TOTAL.labels(**labels).inc()
-    HTTP_REQUEST_DURATION_SECONDS.labels(**labels).observe(
-        perf_counter() - start_time
-    )
+    duration = perf_counter() - start_time
+    HTTP_REQUESTS_TOTAL.labels(
+        **LABEL_GUARD.labels("http_requests_total", labels)
+    ).inc()
+    HTTP_REQUEST_DURATION_SECONDS.labels(
+        **LABEL_GUARD.labels("http_request_duration_seconds", labels)
+    ).observe(duration)
+    LATENCY_STATS.record(endpoint, duration)
+    log_access(request, response, endpoint, duration)
     return response
 
 
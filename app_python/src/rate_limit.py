@@ -0,0 +1,204 @@
+"""Per-client token-bucket rate limiting with a bounded bucket table."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import math
+import os
+from threading import Lock
+from time import monotonic
+from typing import NamedTuple
+
+from flask import Response, jsonify, request
+from prometheus_client import Counter, Gauge
+
+try:
+    from .admission import EXEMPT_PATHS
+    from .metrics import METRICS_REGISTRY, normalize_endpoint_label
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from admission import EXEMPT_PATHS
+    from metrics import METRICS_REGISTRY, normalize_endpoint_label
+
+RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+RATE_LIMIT_KEY_HEADER = os.getenv("RATE_LIMIT_KEY_HEADER", "")
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+RATE_LIMIT_IDLE_TTL_SECONDS = float(os.getenv("RATE_LIMIT_IDLE_TTL_SECONDS", "300"))
+
+DEVOPS_INFO_RATE_LIMITED_TOTAL = Counter(
+    "devops_info_rate_limited_total",
+    "Requests rejected by the per-client rate limiter.",
+    ["endpoint"],
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_RATE_LIMIT_BUCKETS = Gauge(
+    "devops_info_rate_limit_buckets",
+    "Client buckets currently held by the in-memory rate limiter.",
+    registry=METRICS_REGISTRY,
+)
+
+
+class RateLimit(NamedTuple):
+    """Token-bucket parameters: sustained ``rate`` per second and ``burst`` size."""
+
+    rate: float
+    burst: float
+
+
+def parse_rate_limits(raw: str) -> dict[str, RateLimit]:
+    """Parse ``endpoint=rate:burst`` pairs, e.g. ``/=5:10,/visits=20:40``."""
+    limits: dict[str, RateLimit] = {}
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        endpoint, _, spec = item.rpartition("=")
+        rate, _, burst = spec.partition(":")
+        limit = RateLimit(float(rate), float(burst or rate))
+        if not endpoint or limit.rate <= 0 or limit.burst < 1:
+            raise ValueError(f"invalid rate limit rule: {item!r}")
+        limits[endpoint] = limit
+    return limits
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets.
+
+    The in-memory backend is per worker process. A shared implementation
+    (for example Redis with a Lua script) only has to provide ``consume`` to
+    make limits consistent across gunicorn workers and pods.
+    """
+
+    @abstractmethod
+    def consume(self, key: str, limit: RateLimit) -> float:
+        """Take one token for ``key``.
+
+        Return ``0.0`` when the request is allowed, otherwise the number of
+        seconds until a token becomes available.
+        """
+
+    def __len__(self) -> int:
+        return 0
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class InMemoryBackend(RateLimitBackend):
+    """LRU-ordered bucket table bounded by entry count and idle TTL.
+
+    Evicting an idle bucket is lossless once ``idle_ttl`` is long enough to
+    refill it, so the TTL only trims memory; ``max_entries`` is the hard cap
+    that keeps IP-spraying clients from growing the table without bound.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RATE_LIMIT_MAX_CLIENTS,
+        idle_ttl: float = RATE_LIMIT_IDLE_TTL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, limit: RateLimit, now: float | None = None) -> float:
+        if now is None:
+            now = monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = _Bucket(limit.burst, now)
+                self._buckets[key] = bucket
+                self._evict(now)
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(
+                    limit.burst, bucket.tokens + (now - bucket.updated) * limit.rate
+                )
+                bucket.updated = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / limit.rate
+
+    def _evict(self, now: float) -> None:
+        """Drop the least recently used buckets that are idle or over capacity."""
+        buckets = self._buckets
+        while len(buckets) > self.max_entries:
+            buckets.popitem(last=False)
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if now - oldest.updated < self.idle_ttl:
+                break
+            buckets.popitem(last=False)
+
+
+class RateLimiter:
+    """Apply per-endpoint limits to per-client keys over a backend."""
+
+    def __init__(self, limits: dict[str, RateLimit], backend: RateLimitBackend) -> None:
+        self.limits = limits
+        self.backend = backend
+
+    def check(self, endpoint: str, client_key: str) -> float:
+        """Return ``0.0`` if allowed, else seconds to wait before retrying."""
+        limit = self.limits.get(endpoint) or self.limits.get("*")
+        if limit is None:
+            return 0.0
+        return self.backend.consume(f"{endpoint}|{client_key}", limit)
+
+
+RATE_LIMITER = RateLimiter(parse_rate_limits(RATE_LIMITS), InMemoryBackend())
+DEVOPS_INFO_RATE_LIMIT_BUCKETS.set_function(lambda: len(RATE_LIMITER.backend))
+
+
+def get_client_key() -> str:
+    """Return the rate-limit key: the configured header, else the client IP."""
+    if RATE_LIMIT_KEY_HEADER:
+        value = request.headers.get(RATE_LIMIT_KEY_HEADER, "")
+        # X-Forwarded-For style headers list the original client first.
+        client = value.split(",", 1)[0].strip()
+        if client:
+            return client
+    return request.remote_addr or "unknown"
+
+
+def _rate_limited_response(retry_after: float) -> Response:
+    """Return a JSON 429 payload with a whole-second Retry-After."""
+    response = jsonify(
+        {
+            "error": "Too Many Requests",
+            "message": "Rate limit exceeded, retry later",
+        }
+    )
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def enforce_rate_limit() -> Response | None:
+    """Reject clients that exceeded the limit configured for this endpoint.
+
+    Called from the router's ``guard_request`` hook before admission control.
+    """
+    limiter = RATE_LIMITER
+    if not limiter.limits or request.path in EXEMPT_PATHS:
+        return None
+
+    endpoint = normalize_endpoint_label()
+    retry_after = limiter.check(endpoint, get_client_key())
+    if retry_after <= 0:
+        return None
+
+    DEVOPS_INFO_RATE_LIMITED_TOTAL.labels(endpoint=endpoint).inc()
+    return _rate_limited_response(retry_after)
@@ -5,31 +5,89 @@
 from datetime import datetime, timezone
 import inspect
 from multiprocessing import cpu_count
+import os
 import platform
 from pathlib import Path
 import socket
 from threading import Lock
+from time import time, time_ns
 
-from flask import jsonify, request
+from flask import Response, abort, jsonify, request
 
 try:
+    from . import admission
+    from . import cluster
+    from . import heavy_hitters
+    from . import memory_diagnostics
+    from . import rate_limit
+    from . import runtime_metrics  # noqa: F401
+    from .app_config import get_config
+    from .circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+    from .latency_stats import LATENCY_STATS
+    from .shutdown import SHUTDOWN_COORDINATOR, flush_log_handlers
+    from .visit_history import VisitHistory
     from .flask_instance import START_TIME, app, logger
     from .metrics import (
         DEVOPS_INFO_SYSTEM_INFO_DURATION_SECONDS,
+        DEVOPS_INFO_VISITS_PENDING,
+        DEVOPS_INFO_VISITS_RECONCILED_TOTAL,
         generate_metrics_response,
         record_endpoint_call,
     )
 except ImportError:  # pragma: no cover - allows `python src/main.py`
+    import admission
+    import cluster
+    import heavy_hitters
+    import memory_diagnostics
+    import rate_limit
+    import runtime_metrics  # noqa: F401
+    from app_config import get_config
+    from circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+    from latency_stats import LATENCY_STATS
+    from shutdown import SHUTDOWN_COORDINATOR, flush_log_handlers
+    from visit_history import VisitHistory
     from flask_instance import START_TIME, app, logger
     from metrics import (
         DEVOPS_INFO_SYSTEM_INFO_DURATION_SECONDS,
+        DEVOPS_INFO_VISITS_PENDING,
+        DEVOPS_INFO_VISITS_RECONCILED_TOTAL,
         generate_metrics_response,
         record_endpoint_call,
     )
 
 __version__ = "1.12.0"
-VISITS_FILE = Path("/data/visits")
+VISITS_FILE = Path(os.getenv("APP_VISITS_PATH", "/data/visits"))
 _VISITS_LOCK = Lock()
+_visit_history: VisitHistory | None = None
+# (path, file identity, parsed count); replaced as a whole so reads need no lock.
+_visits_cache: tuple[Path, tuple[int, int, int, int], int] | None = None
+# Files modified this recently may be rewritten again within the same mtime
+# tick without changing size, so their cached count is not trusted. Raise it
+# on filesystems with coarse timestamps (e.g. 1000 for 1 second resolution).
+VISITS_CACHE_RACY_NS = int(float(os.getenv("VISITS_CACHE_RACY_MS", "50")) * 1_000_000)
+VISITS_STORAGE_TIMEOUT_SECONDS = float(os.getenv("VISITS_STORAGE_TIMEOUT_MS", "500")) / 1000
+# Deadline for the GET /visits cache revalidation stat while the breaker is
+# not closed; while it is closed the stat runs inline.
+VISITS_STAT_TIMEOUT_SECONDS = float(os.getenv("VISITS_STAT_TIMEOUT_MS", "50")) / 1000
+VISITS_BREAKER_FAILURE_THRESHOLD = int(os.getenv("VISITS_BREAKER_FAILURE_THRESHOLD", "3"))
+VISITS_BREAKER_RESET_SECONDS = float(os.getenv("VISITS_BREAKER_RESET_SECONDS", "10"))
+VISITS_BREAKER = CircuitBreaker(
+    "visits_storage",
+    call_timeout=VISITS_STORAGE_TIMEOUT_SECONDS,
+    failure_threshold=VISITS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=VISITS_BREAKER_RESET_SECONDS,
+)
+_STORAGE_ERRORS = (CircuitOpenError, OSError)
+# Last count seen in storage and visits counted since storage became unavailable.
+_last_known_visits = 0
+_pending_visits = 0
+# (count, pending visits it carried) of a counter write that missed its
+# deadline. The breaker's writer runs calls in order, so the next read shows
+# whether it landed after all.
+_unconfirmed_write: tuple[int, int] | None = None
+# (history, detached visits) of a history write that missed its deadline.
+_unconfirmed_history: tuple[VisitHistory, VisitHistory] | None = None
+INDEX_SECTIONS = ("service", "system", "runtime", "request", "endpoints")
 
 
 def get_service_info() -> dict[str, str]:
@@ -132,18 +190,46 @@ def list_routes() -> list[dict[str, str]]:
     return out
 
 
+def parse_index_fields(raw_fields: str | None) -> tuple[str, ...] | None:
+    """Return requested index sections in canonical order, or None if invalid.
+
+    A missing or blank ``fields`` value selects every section.
+    """
+    if raw_fields is None or not raw_fields.strip():
+        return INDEX_SECTIONS
+
+    requested = {field.strip() for field in raw_fields.split(",") if field.strip()}
+    if not requested <= set(INDEX_SECTIONS):
+        return None
+    return tuple(section for section in INDEX_SECTIONS if section in requested)
+
+
+def build_index_section(section: str):
+    """Compute a single section of the index payload."""
+    match section:
+        case "service":
+            return get_service_info()
+        case "system":
+            return get_platform_info()
+        case "runtime":
+            return get_uptime()
+        case "request":
+            return get_request_info(request)
+        case "endpoints":
+            return list_routes()
+        case _:
+            raise ValueError(f"unknown index section: {section}")
+
+
 def _read_visits_count() -> int:
-    """Read the current visits counter, defaulting to zero when missing."""
+    """Read the current visits counter, defaulting to zero when missing or invalid.
+
+    Other I/O errors propagate so the circuit breaker can see them.
+    """
     try:
         raw_count = VISITS_FILE.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
         return 0
-    except OSError as error:
-        logger.warning(
-            "failed to read visits counter",
-            extra={"path": str(VISITS_FILE), "error": str(error)},
-        )
-        return 0
 
     if not raw_count:
         logger.warning(
@@ -177,34 +263,298 @@ def _write_visits_count(count: int) -> None:
     VISITS_FILE.write_text(f"{count}\n", encoding="utf-8")
 
 
+def _get_visit_history() -> VisitHistory:
+    """Return the visit history stored next to the current visits file.
+
+    Must be called with ``_VISITS_LOCK`` held.
+    """
+    global _visit_history
+
+    path = VISITS_FILE.with_name(f"{VISITS_FILE.name}.history")
+    if _visit_history is None or _visit_history.path != path:
+        _visit_history = VisitHistory(path)
+    return _visit_history
+
+
+def _record_visit_history(now: float) -> None:
+    """Count a visit in the history and flush it when due.
+
+    Must be called with ``_VISITS_LOCK`` held.
+    """
+    history = _get_visit_history()
+    history.record(now)
+    if history.flush_due(now):
+        _flush_visit_history(history, now)
+
+
+def _write_visit_history(pending: VisitHistory, unconfirmed: VisitHistory | None) -> None:
+    """Write ``pending`` plus an earlier timed-out write's visits if it never landed.
+
+    Runs on the breaker's ordered writer thread, so ``unconfirmed`` has
+    finished by the time it is checked.
+    """
+    if unconfirmed is not None and not unconfirmed.persisted:
+        pending.merge(unconfirmed)
+    pending.write_pending()
+
+
+def _flush_visit_history(history: VisitHistory, now: float) -> None:
+    """Write unflushed history through the storage breaker.
+
+    Must be called with ``_VISITS_LOCK`` held. On failure, or while the
+    breaker is open, the visits go back into memory for the next flush. A
+    write that missed its deadline may still land, so its visits are kept
+    aside and only rewritten by the next flush if it did not.
+    """
+    global _unconfirmed_history
+
+    unconfirmed = None
+    if _unconfirmed_history is not None and _unconfirmed_history[0] is history:
+        unconfirmed = _unconfirmed_history[1]
+    pending = history.take_pending(now)
+    if pending is None:
+        if unconfirmed is None:
+            return
+        pending = VisitHistory(history.path, hours=history.hours.slots)
+    try:
+        VISITS_BREAKER.call(_write_visit_history, pending, unconfirmed)
+    except TimeoutError as error:
+        _unconfirmed_history = (history, pending)
+        _log_history_error(history, error)
+        return
+    except _STORAGE_ERRORS as error:
+        # Unless the breaker refused the call, ``pending`` now also holds
+        # any unwritten visits of the earlier timed-out write.
+        history.merge(pending)
+        if isinstance(error, CircuitOpenError):
+            return
+        _log_history_error(history, error)
+    _unconfirmed_history = None
+
+
+def _log_history_error(history: VisitHistory, error: Exception) -> None:
+    logger.warning(
+        "failed to persist visit history",
+        extra={"path": str(history.path), "error": str(error)},
+    )
+
+
+def _visits_file_identity() -> tuple[int, int, int, int] | None:
+    """Return (device, inode, mtime_ns, size) of the visits file, if it exists."""
+    try:
+        stat = VISITS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _log_storage_error(action: str, error: Exception) -> None:
+    if isinstance(error, CircuitOpenError):
+        return
+    logger.warning(
+        f"failed to {action} visits counter",
+        extra={
+            "path": str(VISITS_FILE),
+            "error_type": type(error).__name__,
+            "error": str(error),
+        },
+    )
+
+
+def _write_visits_within_deadline(count: int, visits: int) -> None:
+    """Write ``count`` through the breaker, remembering it if it misses the deadline.
+
+    ``visits`` is how many pending visits the write carries.
+    """
+    global _unconfirmed_write
+
+    try:
+        VISITS_BREAKER.call(_write_visits_count, count)
+    except TimeoutError:
+        _unconfirmed_write = (count, visits)
+        raise
+
+
+def _reconcile_pending_visits() -> None:
+    """Write visits counted in memory back to storage.
+
+    Must be called with ``_VISITS_LOCK`` held; storage errors propagate and
+    leave the pending visits in place for the next attempt. Visits carried
+    by a timed-out write that landed after all are not added again.
+    """
+    global _last_known_visits, _pending_visits, _unconfirmed_write
+
+    stored = VISITS_BREAKER.call(_read_visits_count)
+    reconciled = _pending_visits
+    if _unconfirmed_write is not None:
+        written_count, written_visits = _unconfirmed_write
+        _unconfirmed_write = None
+        if stored >= written_count:
+            _pending_visits -= min(written_visits, _pending_visits)
+    # A torn write may have left a smaller or empty value behind.
+    count = max(stored, _last_known_visits) + _pending_visits
+    if _pending_visits:
+        _write_visits_within_deadline(count, _pending_visits)
+    logger.info(
+        "reconciled visits counted during storage outage",
+        extra={"path": str(VISITS_FILE), "reconciled": reconciled, "visits": count},
+    )
+    DEVOPS_INFO_VISITS_RECONCILED_TOTAL.inc(reconciled)
+    DEVOPS_INFO_VISITS_PENDING.set(0)
+    _last_known_visits = count
+    _pending_visits = 0
+
+
+def _revalidation_identity() -> tuple[int, int, int, int] | None:
+    """Stat the visits file for the lock-free cache check.
+
+    While the breaker is closed the stat runs inline: a thread handoff would
+    cost more than the cache saves, and read-side jitter must not count
+    towards opening the breaker. An inline error returns ``None`` so the
+    caller falls back to the locked, deadline-bounded read. Otherwise the
+    stat goes through the breaker's read pool with a short deadline.
+    """
+    if VISITS_BREAKER.state == CLOSED:
+        try:
+            return _visits_file_identity()
+        except OSError:
+            return None
+    return VISITS_BREAKER.call(
+        _visits_file_identity, timeout=VISITS_STAT_TIMEOUT_SECONDS, ordered=False
+    )
+
+
 def get_visits_count() -> int:
-    """Return the current persisted visits count."""
+    """Return the current persisted visits count.
+
+    The parsed count is cached and revalidated with a single ``stat``, so
+    reads of an unchanged file skip ``_VISITS_LOCK`` and the parse. Writes by
+    this worker, other workers or other pods change the identity and force a
+    re-read. While storage is failing, the last known count plus visits
+    counted in memory is returned instead.
+    """
+    global _last_known_visits, _visits_cache
+
+    try:
+        identity = _revalidation_identity()
+    except _STORAGE_ERRORS as error:
+        _log_storage_error("stat", error)
+        return _last_known_visits + _pending_visits
+    cached = _visits_cache
+    if (
+        not _pending_visits
+        and identity is not None
+        and cached is not None
+        and cached[:2] == (VISITS_FILE, identity)
+    ):
+        return cached[2]
+
     with _VISITS_LOCK:
-        return _read_visits_count()
+        try:
+            if _pending_visits:
+                _reconcile_pending_visits()
+            # Stat before reading: a write racing with the read changes the
+            # identity again, so the next request re-reads instead of trusting it.
+            identity = VISITS_BREAKER.call(_visits_file_identity)
+            count = VISITS_BREAKER.call(_read_visits_count)
+        except _STORAGE_ERRORS as error:
+            _log_storage_error("read", error)
+            return _last_known_visits + _pending_visits
+        _last_known_visits = count
+        if identity is not None and time_ns() - identity[2] > VISITS_CACHE_RACY_NS:
+            _visits_cache = (VISITS_FILE, identity, count)
+        return count
 
 
 def increment_visits_count() -> int:
-    """Increment and persist the visits counter."""
+    """Increment and persist the visits counter.
+
+    Every storage call runs with ``VISITS_STORAGE_TIMEOUT_MS`` as its deadline,
+    so a hung volume holds ``_VISITS_LOCK`` for a bounded time. If storage
+    fails, or the breaker is open, the visit is counted in memory and
+    reconciled by the first increment or read after storage recovers.
+    """
+    global _last_known_visits, _pending_visits
+
     with _VISITS_LOCK:
-        count = _read_visits_count() + 1
-        _write_visits_count(count)
+        _record_visit_history(time())
+        try:
+            if _pending_visits:
+                _reconcile_pending_visits()
+            count = VISITS_BREAKER.call(_read_visits_count) + 1
+            _write_visits_within_deadline(count, 1)
+        except _STORAGE_ERRORS as error:
+            _log_storage_error("persist", error)
+            _pending_visits += 1
+            DEVOPS_INFO_VISITS_PENDING.set(_pending_visits)
+            return _last_known_visits + _pending_visits
+        _last_known_visits = count
         return count
 
 
+def flush_pending_visits() -> None:
+    """Try once more to persist visits counted in memory."""
+    with _VISITS_LOCK:
+        if _pending_visits:
+            _reconcile_pending_visits()
+
+
+def flush_visit_history() -> None:
+    """Persist the in-memory visit history immediately."""
+    with _VISITS_LOCK:
+        if _visit_history is not None:
+            _flush_visit_history(_visit_history, time())
+
+
+SHUTDOWN_COORDINATOR.register_flush("visits", flush_pending_visits)
+SHUTDOWN_COORDINATOR.register_flush("visit_history", flush_visit_history)
+SHUTDOWN_COORDINATOR.register_flush("logs", flush_log_handlers)
+
+
+def get_visit_history() -> dict:
+    """Return per-minute and per-hour visit counts, oldest bucket first.
+
+    The shared file is read through the storage breaker without holding
+    ``_VISITS_LOCK``; if that fails only this worker's unflushed visits are
+    returned.
+    """
+    with _VISITS_LOCK:
+        history = _get_visit_history()
+    try:
+        stored = VISITS_BREAKER.call(history.read_stored, ordered=False)
+    except _STORAGE_ERRORS as error:
+        _log_storage_error("read history of", error)
+        stored = VisitHistory(history.path, hours=history.hours.slots)
+    with _VISITS_LOCK:
+        return history.snapshot(time(), stored)
+
+
+@app.before_request
+def guard_request() -> Response | None:
+    """Track heavy hitters, then apply per-client rate limits and admission control.
+
+    Tracking runs first so clients rejected with 429 or 503 are still
+    counted. Rate limiting runs before admission so a request answered with
+    429 never takes an admission slot, whose fast release would raise the
+    adaptive limit.
+    """
+    heavy_hitters.track_heavy_hitters()
+    return rate_limit.enforce_rate_limit() or admission.admit_request()
+
+
 @app.route("/")
 def index():
     """Service information."""
-    increment_visits_count()
+    fields = parse_index_fields(request.args.get("fields"))
+    if fields is None:
+        return _bad_request(
+            f"'fields' must be a comma-separated subset of {', '.join(INDEX_SECTIONS)}"
+        )
+
+    if get_config().flag("visitsCounter", default=True):
+        increment_visits_count()
     record_endpoint_call("/")
-    return jsonify(
-        {
-            "service": get_service_info(),
-            "system": get_platform_info(),
-            "runtime": get_uptime(),
-            "request": get_request_info(request),
-            "endpoints": list_routes(),
-        }
-    )
+    return jsonify({section: build_index_section(section) for section in fields})
 
 
 @app.route("/visits")
@@ -214,6 +564,52 @@ def visits():
     return jsonify({"visits": get_visits_count()})
 
 
+@app.route("/visits/history")
+def visits_history():
+    """Per-minute and per-hour visit counts."""
+    record_endpoint_call("/visits/history")
+    return jsonify(get_visit_history())
+
+
+@app.route("/stats")
+def stats():
+    """Per-endpoint latency quantiles over 1, 5 and 15 minutes."""
+    record_endpoint_call("/stats")
+    sketches = request.args.get("format") == "sketch"
+    return jsonify(LATENCY_STATS.snapshot(sketches=sketches))
+
+
+@app.route("/stats/clients")
+def stats_clients():
+    """Heaviest client IPs and user agents."""
+    record_endpoint_call("/stats/clients")
+    limit = request.args.get("limit", 10, type=int)
+    return jsonify(heavy_hitters.get_top_clients(max(1, limit)))
+
+
+def get_local_cluster_member() -> dict:
+    """Return this replica's data in the same shape peers return over HTTP."""
+    return {
+        "visits": {"visits": get_visits_count()},
+        "health": {"status": "healthy"},
+        "stats": LATENCY_STATS.snapshot(sketches=True),
+    }
+
+
+@app.route("/cluster")
+def cluster_view():
+    """Merged visits, health and latency stats across replicas."""
+    record_endpoint_call("/cluster")
+    return jsonify(cluster.CLUSTER_VIEW.snapshot(get_local_cluster_member))
+
+
+@app.route("/config")
+def config():
+    """Currently loaded application config."""
+    record_endpoint_call("/config")
+    return jsonify(get_config().as_dict())
+
+
 @app.route("/health")
 def health():
     """Health check."""
@@ -225,6 +621,8 @@ def health():
 def readiness():
     """Readiness check."""
     record_endpoint_call("/ready")
+    if SHUTDOWN_COORDINATOR.draining:
+        return _status_response("draining"), 503
     return _status_response("ready")
 
 
@@ -246,6 +644,103 @@ def metrics():
     return generate_metrics_response()
 
 
+def _require_memory_diagnostics() -> None:
+    """Hide memory diagnostics routes unless explicitly enabled."""
+    if not memory_diagnostics.MEMORY_DIAGNOSTICS_ENABLED:
+        abort(404)
+
+
+def _bad_request(message: str):
+    """Return a JSON 400 payload."""
+    return jsonify({"error": "Bad Request", "message": message}), 400
+
+
+@app.route("/debug/memory")
+def memory_status():
+    """Memory tracing status."""
+    _require_memory_diagnostics()
+    record_endpoint_call("/debug/memory")
+    return jsonify(memory_diagnostics.get_tracing_status())
+
+
+@app.route("/debug/memory/start", methods=["POST"])
+def memory_start():
+    """Start tracemalloc tracing."""
+    _require_memory_diagnostics()
+    record_endpoint_call("/debug/memory/start")
+    frames = request.args.get(
+        "frames", memory_diagnostics.DEFAULT_TRACE_FRAMES, type=int
+    )
+    return jsonify(memory_diagnostics.start_tracing(frames))
+
+
+@app.route("/debug/memory/stop", methods=["POST"])
+def memory_stop():
+    """Stop tracemalloc tracing and drop snapshots."""
+    _require_memory_diagnostics()
+    record_endpoint_call("/debug/memory/stop")
+    return jsonify(memory_diagnostics.stop_tracing())
+
+
+@app.route("/debug/memory/snapshots", methods=["POST"])
+def memory_take_snapshot():
+    """Take a heap snapshot and return its top allocation sites."""
+    _require_memory_diagnostics()
+    record_endpoint_call("/debug/memory/snapshots")
+    try:
+        snapshot_id = memory_diagnostics.take_snapshot()
+    except RuntimeError as error:
+        return jsonify({"error": "Conflict", "message": str(error)}), 409
+    return _memory_top_response(snapshot_id)
+
+
+@app.route("/debug/memory/snapshots/<int:snapshot_id>")
+def memory_snapshot(snapshot_id: int):
+    """Top allocation sites of a stored heap snapshot."""
+    _require_memory_diagnostics()
+    record_endpoint_call("/debug/memory/snapshots/<int:snapshot_id>")
+    return _memory_top_response(snapshot_id)
+
+
+@app.route("/debug/memory/diff")
+def memory_diff():
+    """Allocation diff between two stored heap snapshots."""
+    _require_memory_diagnostics()
+    record_endpoint_call("/debug/memory/diff")
+    from_id = request.args.get("from", type=int)
+    to_id = request.args.get("to", type=int)
+    if from_id is None or to_id is None:
+        return _bad_request("Query parameters 'from' and 'to' must be snapshot ids")
+
+    try:
+        diff = memory_diagnostics.get_allocation_diff(
+            from_id,
+            to_id,
+            limit=request.args.get("limit", memory_diagnostics.DEFAULT_TOP_LIMIT, type=int),
+            group_by=request.args.get("group_by", "lineno"),
+        )
+    except memory_diagnostics.SnapshotNotFoundError:
+        abort(404)
+    except ValueError as error:
+        return _bad_request(str(error))
+    return jsonify(diff)
+
+
+def _memory_top_response(snapshot_id: int):
+    """Return top allocation sites for a snapshot as JSON."""
+    try:
+        top = memory_diagnostics.get_top_allocations(
+            snapshot_id,
+            limit=request.args.get("limit", memory_diagnostics.DEFAULT_TOP_LIMIT, type=int),
+            group_by=request.args.get("group_by", "lineno"),
+        )
+    except memory_diagnostics.SnapshotNotFoundError:
+        abort(404)
+    except ValueError as error:
+        return _bad_request(str(error))
+    return jsonify(top)
+
+
 @app.errorhandler(404)
 def not_found(error):  # noqa: ARG001
     """Return a JSON 404 payload."""
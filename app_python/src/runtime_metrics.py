@@ -0,0 +1,121 @@
+"""Process runtime metrics: GC pauses plus RSS, fds, threads and context switches."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import gc
+import os
+from pathlib import Path
+from time import perf_counter
+
+from prometheus_client import Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+try:
+    from .metrics import METRICS_REGISTRY
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from metrics import METRICS_REGISTRY
+
+PROC_SELF = Path("/proc/self")
+
+DEVOPS_INFO_GC_PAUSE_SECONDS = Histogram(
+    "devops_info_gc_pause_seconds",
+    "Time spent in garbage collection pauses.",
+    ["generation"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+    registry=METRICS_REGISTRY,
+)
+_GC_PAUSE_BY_GENERATION = {
+    generation: DEVOPS_INFO_GC_PAUSE_SECONDS.labels(generation=str(generation))
+    for generation in range(3)
+}
+_gc_start_time: float | None = None
+
+
+def _record_gc_pause(phase: str, info: dict[str, int]) -> None:
+    """Time each collection between its ``start`` and ``stop`` callbacks."""
+    global _gc_start_time
+
+    if phase == "start":
+        _gc_start_time = perf_counter()
+        return
+    if _gc_start_time is None:
+        return
+
+    pause = perf_counter() - _gc_start_time
+    _gc_start_time = None
+    histogram = _GC_PAUSE_BY_GENERATION.get(info.get("generation", -1))
+    if histogram is not None:
+        histogram.observe(pause)
+
+
+def _read_proc_status(proc_dir: Path) -> dict[str, str]:
+    """Parse ``/proc/<pid>/status`` into a key/value mapping."""
+    status: dict[str, str] = {}
+    with open(proc_dir / "status", encoding="ascii") as status_file:
+        for line in status_file:
+            key, _, value = line.partition(":")
+            status[key] = value.strip()
+    return status
+
+
+class RuntimeCollector(Collector):
+    """Read process resource usage from procfs at scrape time.
+
+    Nothing is sampled in the background; every value comes from a single
+    ``status`` read and an ``fd`` directory scan per scrape. Metrics are
+    silently omitted on platforms without procfs.
+    """
+
+    def __init__(self, proc_dir: Path = PROC_SELF) -> None:
+        self.proc_dir = proc_dir
+
+    def collect(self) -> Iterator[GaugeMetricFamily | CounterMetricFamily]:
+        try:
+            status = _read_proc_status(self.proc_dir)
+        except OSError:
+            return
+
+        if "VmRSS" in status:
+            # Reported in kB, e.g. "VmRSS:   12345 kB".
+            rss_kib = int(status["VmRSS"].split()[0])
+            yield GaugeMetricFamily(
+                "process_resident_memory_bytes",
+                "Resident memory size in bytes.",
+                value=rss_kib * 1024,
+            )
+        if "Threads" in status:
+            yield GaugeMetricFamily(
+                "process_threads",
+                "Number of OS threads in the process.",
+                value=int(status["Threads"]),
+            )
+
+        switches = CounterMetricFamily(
+            "process_context_switches",
+            "Context switches performed by the process.",
+            labels=["type"],
+        )
+        for switch_type in ("voluntary", "nonvoluntary"):
+            key = f"{switch_type}_ctxt_switches"
+            if key in status:
+                switches.add_metric([switch_type], int(status[key]))
+        yield switches
+
+        try:
+            open_fds = sum(1 for _ in os.scandir(self.proc_dir / "fd"))
+        except OSError:
+            return
+        yield GaugeMetricFamily(
+            "process_open_fds",
+            "Number of open file descriptors.",
+            value=open_fds,
+        )
+
+
+RUNTIME_COLLECTOR = RuntimeCollector()
+METRICS_REGISTRY.register(RUNTIME_COLLECTOR)
+
+if _record_gc_pause not in gc.callbacks:
+    gc.callbacks.append(_record_gc_pause)
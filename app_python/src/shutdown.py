@@ -0,0 +1,149 @@
+"""Graceful drain on SIGTERM: fail readiness, finish in-flight work, flush state."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+import os
+import signal
+import threading
+from time import monotonic, sleep
+from typing import Any
+
+from prometheus_client import Gauge
+
+try:
+    from .flask_instance import logger
+    from .metrics import HTTP_REQUESTS_IN_PROGRESS, METRICS_REGISTRY
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from flask_instance import logger
+    from metrics import HTTP_REQUESTS_IN_PROGRESS, METRICS_REGISTRY
+
+# Time to keep serving after SIGTERM so the failing readiness probe takes the
+# pod out of the Service before new connections stop being accepted.
+SHUTDOWN_DRAIN_DELAY_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_DELAY_SECONDS", "5"))
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "20"))
+_POLL_INTERVAL_SECONDS = 0.05
+
+DEVOPS_INFO_DRAINING = Gauge(
+    "devops_info_draining",
+    "1 while the worker is draining for shutdown.",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_DRAIN_DURATION_SECONDS = Gauge(
+    "devops_info_drain_duration_seconds",
+    "Time the last drain spent waiting for in-flight requests.",
+    registry=METRICS_REGISTRY,
+)
+DEVOPS_INFO_DRAIN_ABANDONED_REQUESTS = Gauge(
+    "devops_info_drain_abandoned_requests",
+    "Requests still in flight when the last drain hit its deadline.",
+    registry=METRICS_REGISTRY,
+)
+
+
+def count_in_flight_requests() -> int:
+    """Sum ``http_requests_in_progress`` across all method/endpoint labels."""
+    return int(
+        sum(
+            sample.value
+            for family in HTTP_REQUESTS_IN_PROGRESS.collect()
+            for sample in family.samples
+        )
+    )
+
+
+class ShutdownCoordinator:
+    """Coordinate the drain sequence shared by readiness and shutdown hooks."""
+
+    def __init__(self, in_flight: Callable[[], int] = count_in_flight_requests) -> None:
+        self._in_flight = in_flight
+        self._draining = threading.Event()
+        self._flushers: list[tuple[str, Callable[[], Any]]] = []
+
+    @property
+    def draining(self) -> bool:
+        return self._draining.is_set()
+
+    def register_flush(self, name: str, flush: Callable[[], Any]) -> None:
+        """Run ``flush`` once in-flight requests have finished draining."""
+        self._flushers.append((name, flush))
+
+    def begin_drain(self) -> None:
+        """Flip readiness to not-ready; requests keep being served."""
+        if not self._draining.is_set():
+            self._draining.set()
+            DEVOPS_INFO_DRAINING.set(1)
+            logger.info("drain started", extra={"event": "shutdown_drain_start"})
+
+    def drain(self, timeout: float = SHUTDOWN_DRAIN_TIMEOUT_SECONDS) -> bool:
+        """Wait for in-flight requests up to ``timeout``, then run every flush.
+
+        Returns whether all requests finished before the deadline.
+        """
+        self.begin_drain()
+        started = monotonic()
+        deadline = started + timeout
+        remaining = self._in_flight()
+        while remaining and monotonic() < deadline:
+            sleep(_POLL_INTERVAL_SECONDS)
+            remaining = self._in_flight()
+        duration = monotonic() - started
+
+        DEVOPS_INFO_DRAIN_DURATION_SECONDS.set(duration)
+        DEVOPS_INFO_DRAIN_ABANDONED_REQUESTS.set(remaining)
+        for name, flush in self._flushers:
+            try:
+                flush()
+            except Exception as error:  # noqa: BLE001 - keep flushing the rest
+                logger.error(
+                    "drain flush failed",
+                    extra={"flush": name, "error_type": type(error).__name__, "error": str(error)},
+                )
+
+        logger.info(
+            "drain finished",
+            extra={
+                "event": "shutdown_drain_end",
+                "duration_seconds": round(duration, 3),
+                "abandoned_requests": remaining,
+            },
+        )
+        return remaining == 0
+
+
+SHUTDOWN_COORDINATOR = ShutdownCoordinator()
+
+
+def flush_log_handlers() -> None:
+    """Flush buffered service and access log handlers (e.g. pending Loki batches)."""
+    for name in ("devops_info_service", "devops_info_service.access"):
+        for handler in logging.getLogger(name).handlers:
+            handler.flush()
+
+
+def install_gunicorn_drain(worker) -> None:
+    """Replace a gunicorn worker's SIGTERM handling with a graceful drain.
+
+    On SIGTERM the worker turns not-ready, keeps serving for
+    ``SHUTDOWN_DRAIN_DELAY_SECONDS``, waits for in-flight requests, flushes,
+    and only then lets gunicorn's worker loop exit.
+    """
+
+    started = threading.Event()
+
+    def _drain_then_stop() -> None:
+        SHUTDOWN_COORDINATOR.begin_drain()
+        sleep(SHUTDOWN_DRAIN_DELAY_SECONDS)
+        SHUTDOWN_COORDINATOR.drain()
+        worker.alive = False
+
+    def _handle_sigterm(signum, frame) -> None:  # noqa: ARG001
+        # Signal handlers may interrupt code holding logging or metric locks,
+        # so all real work happens on the drain thread.
+        if started.is_set():
+            return
+        started.set()
+        threading.Thread(target=_drain_then_stop, name="shutdown-drain", daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
@@ -0,0 +1,274 @@
+"""Per-minute and per-hour visit counts in fixed-size ring buffers."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import os
+from pathlib import Path
+import struct
+import sys
+from time import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no flock on Windows; merges are then unlocked
+    fcntl = None
+
+try:
+    from .flask_instance import logger
+except ImportError:  # pragma: no cover - allows `python src/main.py`
+    from flask_instance import logger
+
+VISIT_HISTORY_HOURS = int(os.getenv("VISIT_HISTORY_HOURS", "24"))
+VISIT_HISTORY_FLUSH_SECONDS = float(os.getenv("VISIT_HISTORY_FLUSH_SECONDS", "10"))
+
+_FILE_MAGIC = b"VHST"
+_FILE_VERSION = 1
+# magic, version, minute slots, hour slots; arrays follow as little-endian uint32.
+_FILE_HEADER = struct.Struct("<4sBII")
+
+
+def _uint32_array(slots: int) -> array:
+    return array("I", bytes(4 * slots))
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``path`` (created if missing) for the block."""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+class RingCounter:
+    """Counts per fixed-width time bucket for the most recent ``slots`` buckets.
+
+    Each slot stores the bucket number it currently holds next to its count,
+    so stale slots are recognised and reset lazily on write instead of being
+    swept on a timer. Memory is ``8 * slots`` bytes regardless of traffic.
+    """
+
+    def __init__(self, slots: int, width_seconds: int) -> None:
+        self.slots = slots
+        self.width_seconds = width_seconds
+        self.buckets = _uint32_array(slots)
+        self.counts = _uint32_array(slots)
+
+    def add(self, now: float, amount: int = 1) -> None:
+        """Add ``amount`` to the bucket containing ``now``."""
+        bucket = int(now // self.width_seconds)
+        index = bucket % self.slots
+        if self.buckets[index] != bucket:
+            self.buckets[index] = bucket
+            self.counts[index] = 0
+        self.counts[index] += amount
+
+    def merge(self, other: RingCounter) -> None:
+        """Add ``other``'s counts; for a slot holding different buckets the newer wins."""
+        for index, (bucket, count) in enumerate(zip(other.buckets, other.counts)):
+            if not count:
+                continue
+            if self.buckets[index] == bucket:
+                self.counts[index] += count
+            elif self.buckets[index] < bucket:
+                self.buckets[index] = bucket
+                self.counts[index] = count
+
+    def series(self, now: float) -> tuple[int, list[int]]:
+        """Return the oldest bucket start (epoch seconds) and counts, oldest first."""
+        current = int(now // self.width_seconds)
+        first = current - self.slots + 1
+        counts = []
+        for bucket in range(first, current + 1):
+            index = bucket % self.slots
+            counts.append(self.counts[index] if self.buckets[index] == bucket else 0)
+        return first * self.width_seconds, counts
+
+
+class VisitHistory:
+    """Minute and hour visit rings persisted to a small binary file.
+
+    The in-memory rings only hold visits recorded since the last flush. A
+    flush merges them into the file under an exclusive lock, so several
+    Gunicorn workers sharing one file add up instead of overwriting each
+    other, and ``snapshot`` reads the file back plus the unflushed visits.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        hours: int = VISIT_HISTORY_HOURS,
+        flush_interval: float = VISIT_HISTORY_FLUSH_SECONDS,
+    ) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.minutes = RingCounter(hours * 60, 60)
+        self.hours = RingCounter(hours, 3600)
+        # Set once ``write_pending`` has stored these visits in the file.
+        self.persisted = False
+        self._last_flush: float | None = None
+
+    @classmethod
+    def _load(cls, path: Path, hours: int, strict: bool = False) -> "VisitHistory":
+        """Return the rings persisted at ``path``; missing or invalid files read as empty.
+
+        Read errors are logged and also read as empty unless ``strict``, in
+        which case they propagate so a flush does not overwrite the file.
+        """
+        history = cls(path, hours=hours)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return history
+        except OSError as error:
+            if strict:
+                raise
+            logger.warning(
+                "failed to read visit history",
+                extra={"path": str(path), "error": str(error)},
+            )
+            return history
+
+        try:
+            history._restore(raw)
+        except ValueError as error:
+            logger.warning(
+                "invalid visit history, starting empty",
+                extra={"path": str(path), "error": str(error)},
+            )
+            history = cls(path, hours=hours)
+        return history
+
+    def _rings(self) -> tuple[array, array, array, array]:
+        return (
+            self.minutes.buckets,
+            self.minutes.counts,
+            self.hours.buckets,
+            self.hours.counts,
+        )
+
+    def _restore(self, raw: bytes) -> None:
+        if len(raw) < _FILE_HEADER.size:
+            raise ValueError("truncated header")
+        magic, version, minute_slots, hour_slots = _FILE_HEADER.unpack_from(raw)
+        if magic != _FILE_MAGIC or version != _FILE_VERSION:
+            raise ValueError("unknown file format")
+        if (minute_slots, hour_slots) != (self.minutes.slots, self.hours.slots):
+            raise ValueError("ring sizes do not match VISIT_HISTORY_HOURS")
+
+        offset = _FILE_HEADER.size
+        for ring in self._rings():
+            size = 4 * len(ring)
+            chunk = raw[offset:offset + size]
+            if len(chunk) != size:
+                raise ValueError("truncated ring data")
+            restored = array("I", chunk)
+            if sys.byteorder == "big":
+                restored.byteswap()
+            ring[:] = restored
+            offset += size
+
+    def to_bytes(self) -> bytes:
+        """Serialize both rings with a small header."""
+        parts = [
+            _FILE_HEADER.pack(
+                _FILE_MAGIC, _FILE_VERSION, self.minutes.slots, self.hours.slots
+            )
+        ]
+        for ring in self._rings():
+            if sys.byteorder == "big":
+                ring = array("I", ring)
+                ring.byteswap()
+            parts.append(ring.tobytes())
+        return b"".join(parts)
+
+    def merge(self, other: VisitHistory) -> None:
+        """Add ``other``'s minute and hour counts into this history."""
+        self.minutes.merge(other.minutes)
+        self.hours.merge(other.hours)
+
+    def record(self, now: float) -> None:
+        """Count one visit at ``now`` in memory."""
+        self.minutes.add(now)
+        self.hours.add(now)
+
+    def flush_due(self, now: float) -> bool:
+        """Return whether ``flush_interval`` has elapsed since the last flush."""
+        return self._last_flush is None or now - self._last_flush >= self.flush_interval
+
+    def take_pending(self, now: float | None = None) -> VisitHistory | None:
+        """Detach the unflushed visits for ``write_pending``, or return ``None``.
+
+        Splitting the detach from the write lets the caller run the file I/O
+        elsewhere (e.g. under a deadline) while new visits keep landing in
+        fresh rings; on failure it merges the detached visits back.
+        """
+        self._last_flush = time() if now is None else now
+        if not any(self.hours.counts):
+            return None
+        pending = VisitHistory(self.path, hours=self.hours.slots)
+        pending.minutes, pending.hours = self.minutes, self.hours
+        self.minutes = RingCounter(self.minutes.slots, self.minutes.width_seconds)
+        self.hours = RingCounter(self.hours.slots, self.hours.width_seconds)
+        return pending
+
+    def write_pending(self) -> None:
+        """Merge these visits into the file and atomically replace it.
+
+        The read-merge-write runs under a lock on a ``.lock`` file beside the
+        history, because the history file itself is replaced on every write.
+        I/O errors propagate.
+        """
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path.with_name(f"{self.path.name}.lock")):
+            stored = self.read_stored()
+            stored.merge(self)
+            tmp_path.write_bytes(stored.to_bytes())
+            os.replace(tmp_path, self.path)
+        self.persisted = True
+
+    def flush(self, now: float | None = None) -> None:
+        """Write unflushed visits now; on failure they stay for the next flush."""
+        pending = self.take_pending(now)
+        if pending is None:
+            return
+        try:
+            pending.write_pending()
+        except OSError as error:
+            self.merge(pending)
+            logger.warning(
+                "failed to persist visit history",
+                extra={"path": str(self.path), "error": str(error)},
+            )
+
+    def read_stored(self) -> VisitHistory:
+        """Return the rings persisted in the file; read errors propagate."""
+        return self._load(self.path, self.hours.slots, strict=True)
+
+    def snapshot(
+        self, now: float, stored: VisitHistory | None = None
+    ) -> dict[str, dict[str, str | int | list[int]]]:
+        """Return both series as ``{start, interval_seconds, counts}`` mappings.
+
+        Counts combine ``stored`` (read from the file if not given), which
+        holds every worker's flushed visits, with this worker's unflushed ones.
+        """
+        merged = VisitHistory(self.path, hours=self.hours.slots)
+        merged.merge(self._load(self.path, self.hours.slots) if stored is None else stored)
+        merged.merge(self)
+        result = {}
+        for name, ring in (("minute", merged.minutes), ("hour", merged.hours)):
+            start, counts = ring.series(now)
+            result[name] = {
+                "start": datetime.fromtimestamp(start, tz=timezone.utc).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),
+                "interval_seconds": ring.width_seconds,
+                "counts": counts,
+            }
+        return result
@@ -2,6 +2,7 @@
 
 import pytest
 
+import src.app_config as app_config
 from src.flask_instance import app
 import src.router  # noqa: F401  # Ensure route decorators are loaded.
 
@@ -18,3 +19,17 @@ def client():
 def isolated_visits_file(tmp_path, monkeypatch):
     """Route the visits counter to a per-test temporary file."""
     monkeypatch.setattr(src.router, "VISITS_FILE", tmp_path / "visits")
+    monkeypatch.setattr(src.router, "_visits_cache", None)
+    monkeypatch.setattr(src.router, "_last_known_visits", 0)
+    monkeypatch.setattr(src.router, "_pending_visits", 0)
+    monkeypatch.setattr(src.router, "_unconfirmed_write", None)
+    monkeypatch.setattr(src.router, "_unconfirmed_history", None)
+    src.router.VISITS_BREAKER.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_store(tmp_path, monkeypatch):
+    """Point the config store at a per-test file that does not exist yet."""
+    store = app_config.ConfigStore(tmp_path / "config.json", interval=0)
+    monkeypatch.setattr(app_config, "CONFIG_STORE", store)
+    return store
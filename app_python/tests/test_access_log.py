@@ -0,0 +1,79 @@
+"""Tests for in-app structured access logging."""
+
+import json
+import logging
+
+import pytest
+
+import src.access_log as access_log
+from src.logging_utils import JSONFormatter
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(JSONFormatter().format(record)))
+
+
+@pytest.fixture()
+def access_lines(monkeypatch):
+    """Capture access log records as parsed JSON payloads."""
+    handler = _ListHandler()
+    monkeypatch.setattr(access_log.access_logger, "handlers", [handler])
+    monkeypatch.setattr(access_log, "ACCESS_LOG_MODE", "app")
+    monkeypatch.setattr(access_log, "ACCESS_LOG_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(access_log, "ACCESS_LOG_SLOW_MS", 0.0)
+    monkeypatch.setattr(access_log, "ACCESS_LOG_SLOW_ONLY", False)
+    return handler.lines
+
+
+def test_access_log_emits_typed_json_fields(client, access_lines):
+    """Access lines should carry numeric fields and survive quotes in user agents."""
+    client.get(
+        "/visits?verbose=1",
+        headers={"User-Agent": 'evil "quoted" agent'},
+        environ_overrides={"REMOTE_ADDR": "203.0.113.5"},
+    )
+
+    (line,) = access_lines
+    assert line["logger"] == "devops_info_service.access"
+    assert line["client_ip"] == "203.0.113.5"
+    assert line["method"] == "GET"
+    assert line["path"] == "/visits"
+    assert line["endpoint"] == "/visits"
+    assert line["query"] == "verbose=1"
+    assert line["status_code"] == 200
+    assert isinstance(line["response_bytes"], int) and line["response_bytes"] > 0
+    assert isinstance(line["request_time_us"], int)
+    assert line["user_agent"] == 'evil "quoted" agent'
+
+
+def test_slow_only_mode_keeps_slow_requests_and_errors(access_lines, monkeypatch):
+    """Slow-only mode should drop fast successes but keep slow ones and 5xx."""
+    monkeypatch.setattr(access_log, "ACCESS_LOG_SLOW_ONLY", True)
+    monkeypatch.setattr(access_log, "ACCESS_LOG_SLOW_MS", 100.0)
+
+    assert not access_log.should_log_access(200, 0.01)
+    assert access_log.should_log_access(200, 0.25)
+    assert access_log.should_log_access(503, 0.001)
+
+
+def test_sampling_rate_controls_fast_requests(access_lines, monkeypatch):
+    """A zero sample rate should drop fast successes but never server errors."""
+    monkeypatch.setattr(access_log, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+
+    assert not access_log.should_log_access(200, 0.001)
+    assert not access_log.should_log_access(404, 0.001)
+    assert access_log.should_log_access(500, 0.001)
+
+
+def test_access_log_is_silent_when_gunicorn_owns_it(client, access_lines, monkeypatch):
+    """ACCESS_LOG_MODE=gunicorn should leave access logging to gunicorn."""
+    monkeypatch.setattr(access_log, "ACCESS_LOG_MODE", "gunicorn")
+
+    client.get("/health")
+
+    assert access_lines == []
@@ -0,0 +1,114 @@
+"""Tests for admission control and load shedding."""
+
+import pytest
+
+import src.admission as admission
+from src.admission import AdmissionController
+from src.metrics import METRICS_REGISTRY
+import src.rate_limit as rate_limit
+from src.rate_limit import InMemoryBackend, RateLimit, RateLimiter
+
+
+@pytest.fixture()
+def controller(monkeypatch):
+    """Install a static controller with a single slot."""
+    controller = AdmissionController(1)
+    monkeypatch.setattr(admission, "ADMISSION_CONTROLLER", controller)
+    return controller
+
+
+def test_admission_is_disabled_by_default(client):
+    """With no configured limit every request should be admitted."""
+    assert not admission.ADMISSION_CONTROLLER.enabled
+    assert client.get("/visits").status_code == 200
+
+
+def test_requests_over_limit_are_shed_with_retry_after(client, controller):
+    """A full controller should answer 503 with Retry-After and count the shed."""
+    labels = {"endpoint": "/visits"}
+    before = METRICS_REGISTRY.get_sample_value(
+        "devops_info_admission_shed_total", labels
+    ) or 0.0
+    assert controller.try_acquire()
+
+    response = client.get("/visits")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(admission.ADMISSION_RETRY_AFTER_SECONDS)
+    assert response.get_json()["error"] == "Service Unavailable"
+    assert METRICS_REGISTRY.get_sample_value(
+        "devops_info_admission_shed_total", labels
+    ) == before + 1.0
+    assert METRICS_REGISTRY.get_sample_value(
+        "http_requests_total",
+        {"method": "GET", "endpoint": "/visits", "status_code": "503"},
+    ) >= 1.0
+
+
+def test_health_probes_are_exempt_from_shedding(client, controller):
+    """Liveness and readiness probes must pass even when the limit is reached."""
+    assert controller.try_acquire()
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 200
+    assert controller.in_flight == 1
+
+
+def test_rate_limited_requests_never_take_an_admission_slot(client, monkeypatch):
+    """The rate limiter should answer before admission control sees the request."""
+    controller = AdmissionController(1)
+    monkeypatch.setattr(admission, "ADMISSION_CONTROLLER", controller)
+    limiter = RateLimiter({"/visits": RateLimit(rate=0.01, burst=1)}, InMemoryBackend())
+    monkeypatch.setattr(rate_limit, "RATE_LIMITER", limiter)
+    assert client.get("/visits").status_code == 200
+    assert controller.try_acquire()
+
+    assert client.get("/visits").status_code == 429
+    assert controller.in_flight == 1
+
+
+def test_admitted_requests_release_their_slot(client, controller):
+    """Slots should be released on teardown, including for failed requests."""
+    assert client.get("/visits").status_code == 200
+    assert client.get("/does-not-exist").status_code == 404
+    assert controller.in_flight == 0
+
+
+def test_adaptive_limit_decreases_on_slow_and_recovers_on_fast():
+    """AIMD should cut the limit on slow requests and creep back on fast ones."""
+    controller = AdmissionController(
+        10, mode="adaptive", min_limit=2, target_latency=0.1
+    )
+
+    assert controller.try_acquire()
+    controller.release(latency=1.0)
+    assert controller.limit == 9
+
+    # A second slow request within the cooldown must not cut the limit again.
+    assert controller.try_acquire()
+    controller.release(latency=1.0)
+    assert controller.limit == 9
+
+    for _ in range(20):
+        assert controller.try_acquire()
+        controller.release(latency=0.01)
+    assert controller.limit == 10
+    assert METRICS_REGISTRY.get_sample_value("devops_info_admission_limit") == 10
+
+
+def test_adaptive_limit_never_drops_below_minimum(monkeypatch):
+    """Repeated slow requests should stop at the configured minimum limit."""
+    monkeypatch.setattr(admission, "DECREASE_COOLDOWN_SECONDS", 0.0)
+    controller = AdmissionController(4, mode="adaptive", min_limit=2, target_latency=0.1)
+
+    for _ in range(50):
+        assert controller.try_acquire()
+        controller.release(latency=1.0)
+
+    assert controller.limit == 2
+
+
+def test_invalid_admission_mode_is_rejected():
+    """Unknown modes should fail fast at construction."""
+    with pytest.raises(ValueError):
+        AdmissionController(4, mode="magic")
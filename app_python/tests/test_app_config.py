@@ -0,0 +1,100 @@
+"""Tests for the hot-reloadable application config store."""
+
+import json
+import os
+from unittest.mock import Mock
+
+import pytest
+
+import src.app_config as app_config
+
+
+def _write_config(path, visits_counter: bool, environment: str = "test") -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "application": {"name": "devops-info-service", "environment": environment},
+                "featureFlags": {"visitsCounter": visits_counter, "metrics": True},
+                "settings": {"reloadStrategy": "hot-reload"},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def test_missing_config_file_uses_defaults(isolated_config_store):
+    """A missing file should yield an empty snapshot and default flags."""
+    snapshot = isolated_config_store.get()
+
+    assert snapshot.feature_flags == {}
+    assert snapshot.flag("visitsCounter", default=True) is True
+
+
+def test_snapshot_is_immutable(isolated_config_store):
+    """Handlers must not be able to mutate the shared snapshot."""
+    _write_config(isolated_config_store.path, visits_counter=True)
+    snapshot = isolated_config_store.get()
+
+    with pytest.raises(TypeError):
+        snapshot.feature_flags["visitsCounter"] = False
+    with pytest.raises(AttributeError):
+        snapshot.generation = 99
+
+
+def test_store_reloads_only_when_file_identity_changes(isolated_config_store, monkeypatch):
+    """The file should be parsed once per change, not once per read."""
+    path = isolated_config_store.path
+    _write_config(path, visits_counter=True)
+    read_spy = Mock(wraps=app_config.json.loads)
+    monkeypatch.setattr(app_config.json, "loads", read_spy)
+
+    first = isolated_config_store.get()
+    assert isolated_config_store.get() is first
+    assert read_spy.call_count == 1
+
+    _write_config(path, visits_counter=False, environment="changed")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = isolated_config_store.get()
+
+    assert read_spy.call_count == 2
+    assert second.generation == first.generation + 1
+    assert second.flag("visitsCounter") is False
+    assert second.application["environment"] == "changed"
+
+
+def test_store_skips_stat_until_interval_elapses(tmp_path, monkeypatch):
+    """Within the interval, get() should not touch the filesystem at all."""
+    store = app_config.ConfigStore(tmp_path / "config.json", interval=60)
+    store.get()
+    identity_spy = Mock(return_value=None)
+    monkeypatch.setattr(app_config, "_file_identity", identity_spy)
+
+    store.get()
+
+    identity_spy.assert_not_called()
+
+
+def test_invalid_config_keeps_previous_snapshot(isolated_config_store, monkeypatch):
+    """Malformed JSON should be logged and the last good snapshot kept."""
+    path = isolated_config_store.path
+    _write_config(path, visits_counter=False)
+    good = isolated_config_store.get()
+    monkeypatch.setattr(app_config.logger, "warning", Mock())
+
+    path.write_text("{not json", encoding="utf-8")
+
+    assert isolated_config_store.get() is good
+    app_config.logger.warning.assert_called_once()
+
+
+def test_visits_counter_flag_disables_increment_without_restart(client, isolated_config_store):
+    """Flipping the visitsCounter flag should take effect on the next request."""
+    client.get("/")
+    _write_config(isolated_config_store.path, visits_counter=False)
+    client.get("/")
+
+    assert client.get("/visits").get_json() == {"visits": 1}
+    config = client.get("/config").get_json()
+    assert config["featureFlags"]["visitsCounter"] is False
+    assert config["settings"] == {"reloadStrategy": "hot-reload"}
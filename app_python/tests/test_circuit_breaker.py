@@ -0,0 +1,199 @@
+"""Tests for the circuit breaker and degraded visits persistence."""
+
+import errno
+import threading
+from time import perf_counter, sleep
+
+import pytest
+
+from benchmarks.storage_faults import FaultProfile, constant, inject_visits_faults
+import src.circuit_breaker as circuit_breaker
+import src.metrics as metrics
+import src.router as router
+from src.visit_history import VisitHistory
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fail() -> None:
+    raise OSError(errno.EIO, "simulated failure")
+
+
+@pytest.fixture()
+def breaker():
+    clock = FakeClock()
+    guarded = circuit_breaker.CircuitBreaker(
+        "test", call_timeout=0.05, failure_threshold=2, reset_timeout=5.0, clock=clock
+    )
+    guarded.clock = clock
+    yield guarded
+    guarded.shutdown()
+
+
+@pytest.fixture()
+def visits_breaker(monkeypatch):
+    """Give the router a breaker with a short deadline and manual clock."""
+    clock = FakeClock()
+    guarded = circuit_breaker.CircuitBreaker(
+        "visits_storage", call_timeout=0.05, failure_threshold=2, reset_timeout=5.0, clock=clock
+    )
+    guarded.clock = clock
+    monkeypatch.setattr(router, "VISITS_BREAKER", guarded)
+    yield guarded
+    guarded.shutdown()
+    guarded.reset()
+
+
+def test_breaker_opens_after_consecutive_failures_and_rejects_calls(breaker):
+    """Reaching the failure threshold should stop calls reaching the function."""
+    for _ in range(2):
+        with pytest.raises(OSError):
+            breaker.call(_fail)
+
+    assert breaker.state == circuit_breaker.OPEN
+    with pytest.raises(circuit_breaker.CircuitOpenError):
+        breaker.call(lambda: "unreachable")
+
+
+def test_breaker_times_out_slow_calls(breaker):
+    """Calls past the deadline should raise TimeoutError without waiting for them."""
+    started = perf_counter()
+
+    with pytest.raises(TimeoutError):
+        breaker.call(sleep, 0.3)
+
+    assert perf_counter() - started < 0.25
+
+
+def test_unordered_calls_do_not_queue_behind_a_stuck_call(breaker):
+    """Read-only calls should run on their own threads, which never block exit."""
+    with pytest.raises(TimeoutError):
+        breaker.call(sleep, 0.3)
+
+    assert breaker.call(lambda: "stat", ordered=False) == "stat"
+    assert all(
+        thread.daemon for thread in threading.enumerate() if thread.name.startswith("test")
+    )
+
+
+def test_breaker_half_open_probe_closes_or_reopens(breaker):
+    """After the reset timeout one probe decides the next state."""
+    for _ in range(2):
+        with pytest.raises(OSError):
+            breaker.call(_fail)
+
+    breaker.clock.now = 5.0
+    with pytest.raises(OSError):
+        breaker.call(_fail)
+    assert breaker.state == circuit_breaker.OPEN
+
+    breaker.clock.now = 10.0
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == circuit_breaker.CLOSED
+
+
+def test_hung_storage_degrades_to_memory_and_reconciles(client, visits_breaker):
+    """A hanging volume should neither block requests nor lose visits."""
+    router._write_visits_count(10)
+    reconciled_before = metrics.DEVOPS_INFO_VISITS_RECONCILED_TOTAL._value.get()
+
+    with inject_visits_faults(FaultProfile("hang", latency=constant(0.2))):
+        started = perf_counter()
+        responses = [client.get("/") for _ in range(3)]
+        visits = client.get("/visits").get_json()
+        elapsed = perf_counter() - started
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert visits_breaker.state == circuit_breaker.OPEN
+    assert visits == {"visits": 3}
+    assert elapsed < 0.5
+
+    sleep(0.3)  # let the stuck storage calls finish
+    visits_breaker.clock.now = 5.0
+    assert client.get("/visits").get_json() == {"visits": 13}
+    assert router.VISITS_FILE.read_text(encoding="utf-8") == "13\n"
+    assert metrics.DEVOPS_INFO_VISITS_RECONCILED_TOTAL._value.get() == reconciled_before + 3
+
+
+def test_failed_write_keeps_visit_in_memory(client, visits_breaker):
+    """ENOSPC on write should still answer 200 and count the visit."""
+    router._write_visits_count(4)
+
+    disk_full = FaultProfile("full", write_error_rate=1.0, error_codes=(errno.ENOSPC,))
+    with inject_visits_faults(disk_full):
+        response = client.get("/")
+
+    assert response.status_code == 200
+    assert router._pending_visits == 1
+    assert visits_breaker.state == circuit_breaker.CLOSED
+
+    client.get("/")
+
+    assert router._pending_visits == 0
+    assert router.VISITS_FILE.read_text(encoding="utf-8") == "6\n"
+
+
+def test_hung_history_write_is_cut_off_and_not_written_twice(client, visits_breaker, monkeypatch):
+    """A stuck history flush should not hold the lock, nor be repeated once it lands."""
+    write_pending = VisitHistory.write_pending
+    delays = [0.3]
+
+    def hang(history):
+        sleep(delays.pop() if delays else 0)
+        write_pending(history)
+
+    monkeypatch.setattr(VisitHistory, "write_pending", hang)
+    started = perf_counter()
+    response = client.get("/")
+    elapsed = perf_counter() - started
+
+    assert response.status_code == 200
+    assert elapsed < 0.25
+
+    sleep(0.35)  # the late write lands
+    visits_breaker.clock.now = 5.0
+    router.flush_visit_history()
+
+    assert sum(router._visit_history.read_stored().hours.counts) == 1
+
+
+def test_timed_out_write_that_lands_is_not_counted_twice(visits_breaker, monkeypatch):
+    """Reconciling must not add a visit whose slow write reached storage anyway."""
+    write = router._write_visits_count
+    delays = [0.2]
+
+    def slow_write(count):
+        sleep(delays.pop() if delays else 0)
+        write(count)
+
+    monkeypatch.setattr(router, "_write_visits_count", slow_write)
+
+    assert router.increment_visits_count() == 1
+    sleep(0.25)
+    assert router.increment_visits_count() == 2
+    assert router.VISITS_FILE.read_text(encoding="utf-8") == "2\n"
+    assert router._pending_visits == 0
+
+
+def test_cached_reads_stat_inline_without_tripping_the_breaker(client, visits_breaker, monkeypatch):
+    """Slow revalidation stats on a closed breaker must not count as storage failures."""
+    monkeypatch.setattr(router, "VISITS_CACHE_RACY_NS", 0)
+    router._write_visits_count(5)
+    assert client.get("/visits").get_json() == {"visits": 5}
+    identity = router._visits_file_identity
+
+    def slow_identity():
+        sleep(0.08)
+        return identity()
+
+    monkeypatch.setattr(router, "_visits_file_identity", slow_identity)
+    counts = [client.get("/visits").get_json()["visits"] for _ in range(3)]
+
+    assert counts == [5, 5, 5]
+    assert visits_breaker.state == circuit_breaker.CLOSED
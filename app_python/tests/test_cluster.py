@@ -0,0 +1,252 @@
+"""Tests for the cluster-wide aggregation endpoint."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import src.cluster as cluster
+from src.latency_stats import LogHistogram
+
+
+class _PeerStandIn(BaseHTTPRequestHandler):
+    """Answer /visits, /health and /stats like a replica, over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        self.server.requests += 1
+        self.server.connections.add(self.client_address)
+        time.sleep(self.server.delay)
+        histogram = LogHistogram()
+        for latency in self.server.latencies:
+            histogram.add(latency)
+        payloads = {
+            "/visits": {"visits": self.server.visits},
+            "/health": {"status": "healthy"},
+            "/stats?format=sketch": {"endpoints": {"/": {"1m": histogram.to_dict()}}},
+        }
+        body = json.dumps(payloads[self.path]).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client already gave up on a slow response
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def start_peer():
+    """Start local stand-in replicas; yields a factory returning their servers."""
+    servers = []
+
+    def start(visits: int, latencies: list[float], delay: float = 0.0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _PeerStandIn)
+        server.daemon_threads = True
+        server.visits = visits
+        server.latencies = latencies
+        server.delay = delay
+        server.requests = 0
+        server.connections = set()
+        server.url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _local_member():
+    histogram = LogHistogram()
+    histogram.add(0.004)
+    return {
+        "visits": {"visits": 9},
+        "health": {"status": "healthy"},
+        "stats": {"endpoints": {"/": {"1m": histogram.to_dict()}}},
+    }
+
+
+def _unused_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture()
+def make_view():
+    views = []
+
+    def make(peers, **kwargs):
+        kwargs.setdefault("timeout", 0.5)
+        kwargs.setdefault("cache_seconds", 0)
+        view = cluster.ClusterView(peers, **kwargs)
+        views.append(view)
+        return view
+
+    yield make
+    for view in views:
+        view.close()
+
+
+def test_cluster_view_merges_peer_visits_health_and_sketches(start_peer, make_view):
+    """Peers' counters and latency sketches should be combined with local data."""
+    first = start_peer(visits=10, latencies=[0.001] * 3)
+    second = start_peer(visits=12, latencies=[0.1])
+
+    view = make_view([first.url, second.url])
+    result = view.snapshot(_local_member)
+
+    assert [member["member"] for member in result["members"]] == [
+        "local", *sorted([first.url, second.url])
+    ]
+    assert all(member["ok"] for member in result["members"])
+    assert result["summary"] == {
+        "members": 3,
+        "reachable": 3,
+        "healthy": 3,
+        "visits_max": 12,
+        "visits_sum": 31,
+    }
+    merged = result["stats"]["/"]["1m"]
+    assert merged["count"] == 5
+    assert merged["p50"] == pytest.approx(0.001, rel=0.02)
+    assert merged["mean"] == pytest.approx((0.003 + 0.1 + 0.004) / 5)
+
+
+def test_slow_and_dead_peers_are_reported_without_delaying_response(start_peer, make_view):
+    """Per-peer timeouts should bound the fan-out and mark failing members."""
+    healthy = start_peer(visits=1, latencies=[])
+    slow = start_peer(visits=2, latencies=[], delay=1.0)
+    dead_url = _unused_port_url()
+
+    view = make_view([healthy.url, slow.url, dead_url], timeout=0.2)
+    started = time.perf_counter()
+    result = view.snapshot(_local_member)
+    elapsed = time.perf_counter() - started
+
+    members = {member["member"]: member for member in result["members"]}
+    assert elapsed < 0.8
+    assert members[healthy.url]["ok"] is True
+    assert members[slow.url]["ok"] is False
+    assert members[slow.url]["visits"] is None
+    assert set(members[dead_url]["errors"]) == {"visits", "health", "stats"}
+    assert result["summary"]["reachable"] == 2
+
+
+def test_fan_out_to_many_peers_does_not_queue_behind_a_small_pool(start_peer, make_view):
+    """With more calls than CLUSTER_MAX_CONNECTIONS, none should time out in a queue."""
+    peers = [start_peer(visits=1, latencies=[], delay=0.15) for _ in range(6)]
+
+    view = make_view([peer.url for peer in peers], timeout=0.4, max_connections=2)
+    result = view.snapshot(_local_member)
+
+    assert result["summary"]["reachable"] == 7
+    assert result["summary"]["visits_sum"] == 15
+
+
+def test_cluster_view_caches_results_and_reuses_connections(start_peer, make_view):
+    """Cached snapshots should skip the fan-out; refreshes should reuse pooled connections."""
+    peer = start_peer(visits=3, latencies=[])
+
+    cached_view = make_view([peer.url], cache_seconds=60)
+    first = cached_view.snapshot(_local_member)
+    second = cached_view.snapshot(_local_member)
+
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert peer.requests == 3
+
+    view = make_view([peer.url])
+    for _ in range(4):
+        view.snapshot(_local_member)
+
+    assert peer.requests == 15
+    assert len(peer.connections) < 12
+
+
+def test_malformed_peer_sketch_is_reported_per_member():
+    """A sketch with foreign bucket indexes should mark the member, not fail /cluster."""
+    histogram = LogHistogram()
+    histogram.add(0.002)
+    bad = {**histogram.to_dict(), "buckets": [[10**9, 1]], "count": 1}
+    members = [
+        {"member": member, "errors": {}, "stats": {"endpoints": {"/": {"1m": sketch}}}}
+        for member, sketch in (("local", bad), ("peer", histogram.to_dict()))
+    ]
+
+    result = cluster._merge_members(members)
+
+    assert result["members"][0]["errors"]["stats"].startswith("ValueError")
+    assert result["members"][1]["ok"] is True
+    assert result["stats"]["/"]["1m"]["count"] == 1
+
+
+def test_peers_are_discovered_from_dns_and_exclude_local_replica(make_view):
+    """Headless-service records should become peers, minus this pod's address."""
+
+    def resolver(name, port, type):  # noqa: A002 - mirrors socket.getaddrinfo
+        assert (name, port) == ("app-headless.default.svc.cluster.local", 5000)
+        return [
+            (socket.AF_INET, type, 6, "", ("10.0.0.7", port)),
+            (socket.AF_INET, type, 6, "", ("10.0.0.8", port)),
+            (socket.AF_INET6, type, 6, "", ("fd00::9", port, 0, 0)),
+        ]
+
+    view = make_view(
+        ["http://10.0.0.20:5000"],
+        dns_name="app-headless.default.svc.cluster.local",
+        port=5000,
+        local_addresses=frozenset({"10.0.0.8"}),
+        resolver=resolver,
+    )
+
+    assert view.peers() == [
+        "http://10.0.0.20:5000",
+        "http://10.0.0.7:5000",
+        "http://[fd00::9]:5000",
+    ]
+
+
+def test_slow_dns_falls_back_to_previously_discovered_peers(make_view):
+    """A hanging resolver should be cut off by the timeout, keeping the last answer."""
+    answers = [[(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.7", 5000))]]
+
+    def resolver(name, port, type):  # noqa: A002 - mirrors socket.getaddrinfo
+        if not answers:
+            time.sleep(1.0)
+            return []
+        return answers.pop()
+
+    view = make_view(
+        ["http://10.0.0.20:5000"], dns_name="peers", port=5000, resolver=resolver, timeout=0.1
+    )
+    assert view.peers() == ["http://10.0.0.20:5000", "http://10.0.0.7:5000"]
+
+    started = time.perf_counter()
+    assert view.peers() == ["http://10.0.0.20:5000", "http://10.0.0.7:5000"]
+    assert time.perf_counter() - started < 0.5
+
+
+def test_cluster_endpoint_returns_local_view_without_peers(client, monkeypatch, make_view):
+    """GET /cluster should work on a single replica with no peers configured."""
+    monkeypatch.setattr(cluster, "CLUSTER_VIEW", make_view([]))
+    client.get("/")
+
+    payload = client.get("/cluster").get_json()
+
+    assert payload["summary"]["members"] == 1
+    assert payload["members"][0]["member"] == "local"
+    assert payload["members"][0]["visits"] == 1
+    assert "/" in payload["stats"]
@@ -1,6 +1,7 @@
 """Unit tests for HTTP endpoints and error handling."""
 
 from datetime import datetime
+import os
 from unittest.mock import Mock
 
 import src.router as router
@@ -127,6 +128,55 @@ def test_visits_falls_back_to_zero_when_counter_file_is_malformed(
     warning_mock.assert_called()
 
 
+def _write_aged_visits(visits_file, value: str, mtime_ns: int) -> None:
+    visits_file.write_text(value, encoding="utf-8")
+    os.utime(visits_file, ns=(mtime_ns, mtime_ns))
+
+
+def test_visits_reads_are_served_from_cache_while_file_is_unchanged(client, monkeypatch):
+    """Repeated GET /visits should not re-read an unchanged counter file."""
+    _write_aged_visits(router.VISITS_FILE, "7\n", 1_000_000_000)
+    read_mock = Mock(wraps=router._read_visits_count)
+    monkeypatch.setattr(router, "_read_visits_count", read_mock)
+
+    responses = [client.get("/visits").get_json() for _ in range(3)]
+
+    assert responses == [{"visits": 7}] * 3
+    assert read_mock.call_count == 1
+
+
+def test_visits_cache_sees_external_same_size_update(client):
+    """A rewrite by another process must invalidate the cache even at equal size."""
+    _write_aged_visits(router.VISITS_FILE, "7\n", 1_000_000_000)
+    assert client.get("/visits").get_json() == {"visits": 7}
+
+    _write_aged_visits(router.VISITS_FILE, "8\n", 2_000_000_000)
+
+    assert client.get("/visits").get_json() == {"visits": 8}
+
+
+def test_visits_cache_does_not_trust_recently_modified_file(client, monkeypatch):
+    """Files modified within the racy window should be re-read on every request."""
+    router.VISITS_FILE.write_text("7\n", encoding="utf-8")
+    read_mock = Mock(wraps=router._read_visits_count)
+    monkeypatch.setattr(router, "_read_visits_count", read_mock)
+
+    client.get("/visits")
+    client.get("/visits")
+
+    assert read_mock.call_count == 2
+
+
+def test_visits_reflects_own_increments(client):
+    """Increments by this worker should be visible to the next read."""
+    _write_aged_visits(router.VISITS_FILE, "7\n", 1_000_000_000)
+    assert client.get("/visits").get_json() == {"visits": 7}
+
+    client.get("/")
+
+    assert client.get("/visits").get_json() == {"visits": 8}
+
+
 def test_health_returns_expected_json_structure_and_types(client):
     """GET /health should report healthy status and typed runtime metadata."""
     response = client.get("/health")
@@ -209,3 +259,33 @@ def test_ready_returns_json_500_when_uptime_probe_fails(client, monkeypatch):
         "error": "Internal Server Error",
         "message": "An unexpected error occurred",
     }
+
+
+def test_index_fields_returns_only_requested_sections(client, monkeypatch):
+    """GET /?fields= should compute only the requested sections."""
+    monkeypatch.setattr(router, "get_platform_info", _raise_runtime_error)
+    monkeypatch.setattr(router, "list_routes", _raise_runtime_error)
+
+    response = client.get("/?fields=runtime,service")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert set(payload) == {"service", "runtime"}
+    assert payload["service"]["name"] == "devops-info-service"
+
+
+def test_index_fields_still_counts_visits(client):
+    """Sparse index requests should increment the visits counter like full ones."""
+    client.get("/?fields=service")
+    client.get("/")
+
+    assert client.get("/visits").get_json() == {"visits": 2}
+
+
+def test_index_fields_rejects_unknown_sections(client):
+    """Unknown section names should return JSON 400 without counting a visit."""
+    response = client.get("/?fields=service,secrets")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Bad Request"
+    assert client.get("/visits").get_json() == {"visits": 0}
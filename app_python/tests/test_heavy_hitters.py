@@ -0,0 +1,103 @@
+"""Tests for Space-Saving heavy hitters and the /stats/clients endpoint."""
+
+from collections import Counter
+import random
+
+import pytest
+
+import src.admission as admission
+import src.heavy_hitters as heavy_hitters
+from src.heavy_hitters import SpaceSaving
+import src.rate_limit as rate_limit
+from src.rate_limit import InMemoryBackend, RateLimit, RateLimiter
+
+
+def test_space_saving_counts_exactly_below_capacity():
+    """With fewer distinct keys than capacity, counts are exact."""
+    sketch = SpaceSaving(capacity=4)
+    for key in "aabacbaa":
+        sketch.add(key)
+
+    assert sketch.top(2) == [
+        {"value": "a", "count": 5, "error": 0},
+        {"value": "b", "count": 2, "error": 0},
+    ]
+    assert sketch.total == 8
+
+
+def test_space_saving_keeps_heavy_hitters_with_bounded_memory():
+    """Frequent keys must survive a long tail of one-off keys."""
+    rng = random.Random(1234)
+    stream = ["hammer"] * 3000 + ["busy"] * 1500 + [f"ip-{i}" for i in range(20000)]
+    rng.shuffle(stream)
+    truth = Counter(stream)
+    sketch = SpaceSaving(capacity=50)
+
+    for key in stream:
+        sketch.add(key)
+
+    top = sketch.top(2)
+    assert len(sketch) == 50
+    assert [entry["value"] for entry in top] == ["hammer", "busy"]
+    for entry in top:
+        assert entry["count"] - entry["error"] <= truth[entry["value"]] <= entry["count"]
+
+
+def test_space_saving_rejects_invalid_capacity():
+    """Capacity must be positive."""
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
+
+
+def test_stats_clients_reports_top_ips_and_user_agents(client, monkeypatch):
+    """Requests should feed the sketches while health probes are ignored."""
+    monkeypatch.setattr(heavy_hitters, "CLIENT_IPS", SpaceSaving(10))
+    monkeypatch.setattr(heavy_hitters, "USER_AGENTS", SpaceSaving(10))
+
+    for _ in range(3):
+        client.get(
+            "/visits",
+            headers={"User-Agent": "scanner/1.0"},
+            environ_overrides={"REMOTE_ADDR": "203.0.113.9"},
+        )
+    client.get("/health", environ_overrides={"REMOTE_ADDR": "10.0.0.1"})
+
+    payload = client.get(
+        "/stats/clients?limit=1",
+        headers={"User-Agent": "curl/8"},
+        environ_overrides={"REMOTE_ADDR": "198.51.100.1"},
+    ).get_json()
+
+    assert payload["observed_requests"] == 4
+    assert payload["client_ip"] == [{"value": "203.0.113.9", "count": 3, "error": 0}]
+    assert payload["user_agent"] == [{"value": "scanner/1.0", "count": 3, "error": 0}]
+
+
+def test_requests_shed_by_admission_are_still_counted(client, monkeypatch):
+    """A 503 from load shedding should not hide the client from the sketches."""
+    monkeypatch.setattr(heavy_hitters, "CLIENT_IPS", SpaceSaving(10))
+    monkeypatch.setattr(heavy_hitters, "USER_AGENTS", SpaceSaving(10))
+    controller = admission.AdmissionController(1)
+    monkeypatch.setattr(admission, "ADMISSION_CONTROLLER", controller)
+    assert controller.try_acquire()
+
+    response = client.get("/visits", environ_overrides={"REMOTE_ADDR": "203.0.113.9"})
+
+    assert response.status_code == 503
+    assert heavy_hitters.CLIENT_IPS.top(1) == [{"value": "203.0.113.9", "count": 1, "error": 0}]
+
+
+def test_rate_limited_requests_are_still_counted(client, monkeypatch):
+    """A 429 from the rate limiter should not hide the client from the sketches."""
+    monkeypatch.setattr(heavy_hitters, "CLIENT_IPS", SpaceSaving(10))
+    monkeypatch.setattr(heavy_hitters, "USER_AGENTS", SpaceSaving(10))
+    limiter = RateLimiter({"/visits": RateLimit(rate=0.01, burst=1)}, InMemoryBackend())
+    monkeypatch.setattr(rate_limit, "RATE_LIMITER", limiter)
+
+    statuses = [
+        client.get("/visits", environ_overrides={"REMOTE_ADDR": "203.0.113.9"}).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [200, 429, 429]
+    assert heavy_hitters.CLIENT_IPS.top(1) == [{"value": "203.0.113.9", "count": 3, "error": 0}]
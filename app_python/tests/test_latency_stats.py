@@ -0,0 +1,98 @@
+"""Tests for latency quantile sketches and the /stats endpoint."""
+
+import random
+
+import pytest
+
+from src.latency_stats import RELATIVE_ACCURACY, LatencyStats, LogHistogram
+
+
+def _exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_log_histogram_quantiles_are_within_relative_accuracy():
+    """Estimates should stay within the configured relative error."""
+    rng = random.Random(42)
+    values = [rng.lognormvariate(-4, 1.2) for _ in range(20000)]
+    histogram = LogHistogram()
+    for value in values:
+        histogram.add(value)
+
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = _exact_quantile(values, q)
+        assert histogram.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY * 1.01)
+
+
+def test_log_histograms_merge_like_a_single_stream():
+    """Merging per-worker sketches should equal sketching the combined stream."""
+    rng = random.Random(7)
+    values = [rng.expovariate(50) for _ in range(5000)]
+    combined, left, right = LogHistogram(), LogHistogram(), LogHistogram()
+    for index, value in enumerate(values):
+        combined.add(value)
+        (left if index % 2 else right).add(value)
+
+    left.merge(LogHistogram.from_dict(right.to_dict()))
+
+    assert list(left.counts) == list(combined.counts)
+    assert left.summary()["p99"] == combined.summary()["p99"]
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"buckets": [[10**6, 1]], "count": 1},
+        {"buckets": [[-1, 1]], "count": 1},
+        {"buckets": [[3, -1]], "count": -1},
+        {"buckets": [[3, 2**32], [3, 2**32]], "count": 2**33},
+        {"buckets": [[3, 1]], "count": 5},
+        {"max_seconds": 1000.0},
+    ],
+)
+def test_from_dict_rejects_payloads_outside_the_layout(change):
+    """Malformed peer sketches should raise ValueError instead of crashing later."""
+    payload = {**LogHistogram().to_dict(), **change}
+
+    with pytest.raises(ValueError):
+        LogHistogram.from_dict(payload)
+
+
+def test_empty_histogram_reports_no_quantiles():
+    """Empty windows should report None rather than a fake latency."""
+    summary = LogHistogram().summary()
+
+    assert summary["count"] == 0
+    assert summary["p50"] is None
+
+
+def test_windows_only_include_recent_minutes():
+    """Older observations should drop out of the shorter windows."""
+    stats = LatencyStats()
+    base = 1_000_000 * 60
+    stats.record("/", 0.5, now=base - 10 * 60)
+    stats.record("/", 0.5, now=base - 3 * 60)
+    stats.record("/", 0.01, now=base)
+    stats.record("/", 0.5, now=base - 20 * 60)
+
+    windows = stats.windows(now=base + 30)["/"]
+
+    assert windows["1m"].count == 1
+    assert windows["5m"].count == 2
+    assert windows["15m"].count == 3
+
+
+def test_stats_endpoint_reports_quantiles_and_sketches(client):
+    """GET /stats should summarize recorded requests per endpoint."""
+    for _ in range(3):
+        client.get("/health")
+
+    summary = client.get("/stats").get_json()
+    health = summary["endpoints"]["/health"]["1m"]
+    assert health["count"] >= 3
+    assert 0 < health["p50"] <= health["p99"] <= health["p999"]
+
+    sketches = client.get("/stats?format=sketch").get_json()
+    raw = sketches["endpoints"]["/health"]["5m"]
+    assert LogHistogram.from_dict(raw).count == raw["count"]
@@ -0,0 +1,138 @@
+"""Tests for the offline access log analytics CLI."""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+import src.log_analytics as log_analytics
+
+
+def _app_line(path: str, status_code: int, micros: int, timestamp: str) -> str:
+    return json.dumps(
+        {
+            "timestamp": timestamp,
+            "level": "INFO",
+            "logger": "devops_info_service.access",
+            "message": "request completed",
+            "path": path,
+            "status_code": status_code,
+            "request_time_us": micros,
+        }
+    )
+
+
+def _gunicorn_line(path: str, status_code: int, micros: int) -> str:
+    return (
+        '{"timestamp":"[18/Oct/2026:12:01:30 +0000]","level":"INFO","logger":"gunicorn.access",'
+        f'"client_ip":"10.0.0.1","method":"GET","path":"{path}","query":"",'
+        f'"status_code":{status_code},"response_bytes":"12","request_time_us":{micros},'
+        '"user_agent":"curl/8"}'
+    )
+
+
+@pytest.fixture()
+def log_files(tmp_path):
+    app_log = tmp_path / "app.log"
+    lines = [
+        '{"timestamp":"2026-10-18T12:00:00Z","level":"INFO","message":"application initialized"}',
+        "not json at all",
+    ]
+    for index in range(100):
+        lines.append(
+            _app_line("/", 200, 1000 + index * 10, f"2026-10-18T12:00:{index % 60:02d}.5Z")
+        )
+    lines += [_app_line("/visits", 500, 40_000, "2026-10-18T12:00:59Z")] * 5
+    lines += [_app_line("/wp-login.php", 404, 300, "2026-10-18T12:00:10Z")] * 7
+    lines += [_app_line("/.env", 404, 300, "2026-10-18T12:00:11Z")] * 3
+    app_log.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    gunicorn_log = tmp_path / "gunicorn.log.gz"
+    with gzip.open(gunicorn_log, "wt", encoding="utf-8") as handle:
+        for _ in range(20):
+            handle.write(_gunicorn_line("/visits", 200, 2000) + "\n")
+    return [app_log, gunicorn_log]
+
+
+def test_analyze_files_reports_paths_errors_404s_and_rollups(log_files):
+    """Access records from app and gunicorn logs should be aggregated together."""
+    report = log_analytics.analyze_files(log_files, workers=1).report()
+
+    assert report["lines"] == 137
+    assert report["skipped"] == 2
+    paths = {row["path"]: row for row in report["paths"]}
+    assert paths["/"]["requests"] == 100
+    assert paths["/"]["p50_ms"] == pytest.approx(1.5, rel=0.03)
+    assert paths["/visits"]["requests"] == 25
+    assert paths["/visits"]["server_errors"] == 5
+    assert paths["/visits"]["error_rate"] == pytest.approx(0.2)
+    assert report["not_found"] == [
+        {"path": "/wp-login.php", "requests": 7},
+        {"path": "/.env", "requests": 3},
+    ]
+    assert [(row["start"], row["requests"]) for row in report["rollups"]] == [
+        ("2026-10-18T12:00:00Z", 115),
+        ("2026-10-18T12:01:00Z", 20),
+    ]
+
+
+def test_split_chunks_and_processes_match_single_pass(log_files):
+    """Tiny chunks across processes should count every line exactly once."""
+    single = log_analytics.analyze_files(log_files, workers=1).report()
+
+    chunked = log_analytics.analyze_files(log_files, workers=2, chunk_bytes=997).report()
+
+    assert len(log_analytics.plan_chunks(log_files, 997)) > 2
+    assert chunked == single
+
+
+def test_paths_beyond_limit_share_overflow_bucket():
+    """Distinct paths past max_paths should not grow memory."""
+    summary = log_analytics.LogSummary(max_paths=2)
+    for index in range(5):
+        summary.add(f"/scan/{index}", 404, 0.001)
+
+    assert set(summary.paths) == {"/scan/0", "/scan/1", "other"}
+    assert summary.paths["other"].requests == 3
+
+
+def test_rollups_beyond_limit_are_coarsened_not_grown():
+    """Past max_rollups the bucket width should double and buckets merge."""
+    summary = log_analytics.LogSummary(rollup_seconds=60, max_rollups=4)
+    for minute in range(10):
+        summary.add("/", 200, 0.001, f"2026-10-18T12:{minute:02d}:00Z")
+
+    other = log_analytics.LogSummary(rollup_seconds=60, max_rollups=4)
+    other.add("/", 200, 0.001, "2026-10-18T12:10:00Z")
+    summary.merge(other)
+
+    report = summary.report()
+    assert report["rollup_seconds"] == 240
+    assert [(row["start"], row["requests"]) for row in report["rollups"]] == [
+        ("2026-10-18T12:00:00Z", 4),
+        ("2026-10-18T12:04:00Z", 4),
+        ("2026-10-18T12:08:00Z", 3),
+    ]
+
+
+def test_cli_writes_csv_section(log_files, capsys):
+    """--format csv should print the chosen section with a header row."""
+    args = [*map(str, log_files), "--format", "csv", "--section", "not_found", "--workers", "1"]
+
+    assert log_analytics.main(args) == 0
+
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert rows == [
+        {"path": "/wp-login.php", "requests": "7"},
+        {"path": "/.env", "requests": "3"},
+    ]
+
+
+def test_cli_rejects_missing_files(tmp_path):
+    """Unknown paths should fail with a usage error."""
+    with pytest.raises(SystemExit) as excinfo:
+        log_analytics.main([str(tmp_path / "missing.log")])
+
+    assert excinfo.value.code == 2
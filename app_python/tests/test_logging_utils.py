@@ -1,9 +1,16 @@
 """Unit tests for JSON logging helpers."""
 
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
 import json
 import logging
+import threading
+import time
 
-from src.logging_utils import JSONFormatter
+import pytest
+
+from src.logging_utils import JSONFormatter, LokiHandler, create_log_handler
 
 
 def test_json_formatter_serializes_message_and_extra_fields():
@@ -32,3 +39,136 @@ def test_json_formatter_serializes_message_and_extra_fields():
     assert payload["path"] == "/health"
     assert payload["status_code"] == 200
     assert payload["timestamp"].endswith("Z")
+
+
+class _LokiStandIn(BaseHTTPRequestHandler):
+    """Record push bodies and answer with the status queued by the test."""
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.pushes.append((dict(self.headers), body))
+        status = self.server.statuses.pop(0) if self.server.statuses else 204
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def loki_server():
+    """Run a local stand-in for Loki's push API."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LokiStandIn)
+    server.pushes = []
+    server.statuses = []
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _loki_logger(handler: LokiHandler) -> logging.Logger:
+    handler.setFormatter(JSONFormatter())
+    logger = logging.getLogger(f"test_loki_{id(handler)}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _push_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/loki/api/v1/push"
+
+
+def test_loki_handler_pushes_gzipped_batches(loki_server):
+    """Records should be shipped as gzip JSON batches once batch_size is reached."""
+    handler = LokiHandler(
+        _push_url(loki_server),
+        labels={"app": "devops-python"},
+        batch_size=2,
+        flush_interval=60,
+    )
+    logger = _loki_logger(handler)
+
+    for index in range(4):
+        logger.info("event %d", index, extra={"path": "/"})
+    handler.close()
+
+    assert len(loki_server.pushes) == 2
+    headers, body = loki_server.pushes[0]
+    assert headers["Content-Encoding"] == "gzip"
+    stream = json.loads(gzip.decompress(body))["streams"][0]
+    assert stream["stream"] == {"app": "devops-python"}
+    timestamp, line = stream["values"][0]
+    assert timestamp.isdigit()
+    assert json.loads(line)["message"] == "event 0"
+
+
+def test_loki_handler_flushes_on_interval(loki_server):
+    """A partial batch should still be shipped after flush_interval."""
+    handler = LokiHandler(
+        _push_url(loki_server), labels={"app": "t"}, batch_size=100, flush_interval=0.05
+    )
+    logger = _loki_logger(handler)
+
+    logger.info("lonely record")
+    deadline = time.monotonic() + 2
+    while not loki_server.pushes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    handler.close()
+
+    assert len(loki_server.pushes) == 1
+
+
+def test_loki_handler_retries_then_falls_back_to_stdout(loki_server):
+    """Server errors should be retried, then the batch written to the fallback stream."""
+    loki_server.statuses = [503, 503, 503]
+    fallback = io.StringIO()
+    handler = LokiHandler(
+        _push_url(loki_server),
+        labels={"app": "t"},
+        batch_size=10,
+        flush_interval=60,
+        max_retries=2,
+        backoff=0.001,
+        fallback=fallback,
+    )
+    logger = _loki_logger(handler)
+
+    logger.warning("kept despite outage")
+    handler.close()
+
+    assert len(loki_server.pushes) == 3
+    assert json.loads(fallback.getvalue())["message"] == "kept despite outage"
+
+
+def test_loki_handler_does_not_retry_rejected_batches(loki_server):
+    """A 400 from Loki is permanent, so the batch goes straight to the fallback."""
+    loki_server.statuses = [400]
+    fallback = io.StringIO()
+    handler = LokiHandler(
+        _push_url(loki_server), labels={"app": "t"}, flush_interval=60, fallback=fallback
+    )
+    logger = _loki_logger(handler)
+
+    logger.info("rejected")
+    handler.close()
+
+    assert len(loki_server.pushes) == 1
+    assert "rejected" in fallback.getvalue()
+
+
+def test_create_log_handler_selects_loki_from_env(monkeypatch):
+    """LOKI_PUSH_URL should switch the service logger to the Loki handler."""
+    monkeypatch.setenv("LOKI_PUSH_URL", "http://127.0.0.1:9/loki/api/v1/push")
+    monkeypatch.setenv("LOKI_LABELS", "app=devops-python, env=dev")
+
+    handler = create_log_handler()
+
+    assert isinstance(handler, LokiHandler)
+    assert handler.labels == {"app": "devops-python", "env": "dev"}
+    handler.close()
@@ -0,0 +1,93 @@
+"""Tests for the tracemalloc-backed memory diagnostics endpoints."""
+
+import tracemalloc
+
+import pytest
+
+import src.memory_diagnostics as memory_diagnostics
+
+
+@pytest.fixture()
+def memory_enabled(monkeypatch):
+    """Enable memory diagnostics and stop tracing after the test."""
+    monkeypatch.setattr(memory_diagnostics, "MEMORY_DIAGNOSTICS_ENABLED", True)
+    yield
+    memory_diagnostics.stop_tracing()
+
+
+def test_memory_routes_return_404_when_disabled(client):
+    """Diagnostics routes should be hidden unless explicitly enabled."""
+    assert client.get("/debug/memory").status_code == 404
+    assert client.post("/debug/memory/start").status_code == 404
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.usefixtures("memory_enabled")
+def test_snapshot_requires_active_tracing(client):
+    """Taking a snapshot before tracing starts should be rejected."""
+    response = client.post("/debug/memory/snapshots")
+
+    assert response.status_code == 409
+    assert response.get_json()["error"] == "Conflict"
+
+
+@pytest.mark.usefixtures("memory_enabled")
+def test_start_clamps_frames_to_tracemalloc_range(client):
+    """Out-of-range traceback depths should be clamped instead of failing."""
+    response = client.post("/debug/memory/start?frames=100000")
+
+    assert response.status_code == 200
+    assert tracemalloc.get_traceback_limit() == memory_diagnostics.MAX_TRACE_FRAMES
+
+
+@pytest.mark.usefixtures("memory_enabled")
+def test_snapshots_report_top_sites_and_diff(client):
+    """Snapshots should expose top allocation sites and a diff between them."""
+    start = client.post("/debug/memory/start?frames=2")
+    assert start.status_code == 200
+    assert start.get_json()["tracing"] is True
+
+    first = client.post("/debug/memory/snapshots").get_json()
+    retained = [bytearray(4096) for _ in range(64)]
+    second = client.post("/debug/memory/snapshots?limit=5").get_json()
+
+    assert second["snapshot"] == first["snapshot"] + 1
+    assert len(second["top"]) <= 5
+    assert {"traceback", "size_bytes", "count"} <= second["top"][0].keys()
+
+    diff = client.get(
+        f"/debug/memory/diff?from={first['snapshot']}&to={second['snapshot']}"
+    ).get_json()
+    assert diff["size_diff_bytes"] >= 64 * 4096
+    assert any(
+        __file__ in frame for entry in diff["top"] for frame in entry["traceback"]
+    )
+    del retained
+
+
+@pytest.mark.usefixtures("memory_enabled")
+def test_memory_diff_validates_query(client):
+    """Diff should reject missing ids, unknown ids and invalid grouping."""
+    client.post("/debug/memory/start")
+    snapshot_id = client.post("/debug/memory/snapshots").get_json()["snapshot"]
+
+    assert client.get("/debug/memory/diff?from=1").status_code == 400
+    assert client.get(f"/debug/memory/diff?from=0&to={snapshot_id}").status_code == 404
+    response = client.get(
+        f"/debug/memory/diff?from={snapshot_id}&to={snapshot_id}&group_by=bogus"
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.usefixtures("memory_enabled")
+def test_stop_tracing_clears_snapshots_and_gauges(client):
+    """Stopping should drop snapshots and reset the exported gauges."""
+    client.post("/debug/memory/start")
+    client.post("/debug/memory/snapshots")
+
+    stopped = client.post("/debug/memory/stop").get_json()
+    metrics_text = client.get("/metrics").get_data(as_text=True)
+
+    assert stopped["tracing"] is False
+    assert stopped["snapshots"] == []
+    assert "devops_info_tracemalloc_traced_bytes 0.0" in metrics_text
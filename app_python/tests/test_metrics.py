@@ -4,6 +4,7 @@
 
 from prometheus_client.parser import text_string_to_metric_families
 
+import src.metrics as metrics
 import src.router as router
 
 
@@ -111,3 +112,60 @@ def test_metrics_count_internal_server_errors_with_status_labels(client, monkeyp
 
     assert response.status_code == 500
     assert after == before + 1.0
+
+
+def test_metrics_collapse_unknown_methods_into_other(client):
+    """Arbitrary request methods should not create their own series."""
+    collapsed_labels = {"metric": "http_requests_total", "reason": "not_allowed"}
+    before = _metric_value(
+        _metrics_text(client), "devops_info_metric_labels_collapsed_total", collapsed_labels
+    ) or 0.0
+
+    client.open("/", method="SCANNER")
+    metrics_text = _metrics_text(client)
+
+    assert "SCANNER" not in metrics_text
+    assert _metric_value(
+        metrics_text,
+        "http_requests_total",
+        {"method": "other", "endpoint": "unmatched", "status_code": "405"},
+    ) >= 1.0
+    assert _metric_value(
+        metrics_text, "devops_info_metric_labels_collapsed_total", collapsed_labels
+    ) == before + 1.0
+
+
+def test_label_guard_caps_series_per_metric():
+    """Label sets beyond the per-metric cap should share one overflow series."""
+    guard = metrics.LabelGuard(max_series=2)
+    before = metrics.DEVOPS_INFO_METRIC_LABELS_COLLAPSED_TOTAL.labels(
+        metric="example", reason="series_limit"
+    )._value.get()
+
+    first = guard.labels("example", {"method": "GET", "endpoint": "/a", "status_code": "200"})
+    guard.labels("example", {"method": "GET", "endpoint": "/b", "status_code": "200"})
+    overflow = guard.labels(
+        "example", {"method": "GET", "endpoint": "/c", "status_code": "200"}
+    )
+    repeated = guard.labels(
+        "example", {"method": "GET", "endpoint": "/a", "status_code": "200"}
+    )
+    other_metric = guard.labels(
+        "another", {"method": "GET", "endpoint": "/c", "status_code": "200"}
+    )
+
+    assert first == repeated == {"method": "GET", "endpoint": "/a", "status_code": "200"}
+    assert overflow == {"method": "other", "endpoint": "other", "status_code": "other"}
+    assert other_metric["endpoint"] == "/c"
+    assert metrics.DEVOPS_INFO_METRIC_LABELS_COLLAPSED_TOTAL.labels(
+        metric="example", reason="series_limit"
+    )._value.get() == before + 1.0
+
+
+def test_label_guard_rejects_unknown_status_codes():
+    """Status codes outside the HTTP registry should collapse to other."""
+    guard = metrics.LabelGuard(max_series=10)
+
+    guarded = guard.labels("example", {"method": "GET", "endpoint": "/", "status_code": "999"})
+
+    assert guarded["status_code"] == "other"
@@ -0,0 +1,78 @@
+"""Tests for the per-client token-bucket rate limiter."""
+
+import pytest
+
+import src.rate_limit as rate_limit
+from src.rate_limit import InMemoryBackend, RateLimit, RateLimiter, parse_rate_limits
+
+
+@pytest.fixture()
+def limiter(monkeypatch):
+    """Limit GET / to a burst of two requests per client."""
+    limiter = RateLimiter({"/": RateLimit(rate=0.01, burst=2)}, InMemoryBackend())
+    monkeypatch.setattr(rate_limit, "RATE_LIMITER", limiter)
+    return limiter
+
+
+def test_parse_rate_limits_accepts_rate_and_optional_burst():
+    """Rules should parse into per-endpoint rate/burst pairs."""
+    assert parse_rate_limits(" /=5:10, /visits=20 ,") == {
+        "/": RateLimit(5.0, 10.0),
+        "/visits": RateLimit(20.0, 20.0),
+    }
+    with pytest.raises(ValueError):
+        parse_rate_limits("/=0:5")
+
+
+def test_bucket_refills_at_configured_rate():
+    """Tokens should drain on use and refill proportionally to elapsed time."""
+    backend = InMemoryBackend()
+    limit = RateLimit(rate=2.0, burst=2)
+
+    assert backend.consume("client", limit, now=0.0) == 0.0
+    assert backend.consume("client", limit, now=0.0) == 0.0
+    assert backend.consume("client", limit, now=0.0) == pytest.approx(0.5)
+    assert backend.consume("client", limit, now=0.5) == 0.0
+
+
+def test_bucket_table_is_bounded_by_lru_and_ttl():
+    """IP spraying must not grow the table past its cap; idle entries expire."""
+    backend = InMemoryBackend(max_entries=3, idle_ttl=10.0)
+    limit = RateLimit(rate=1.0, burst=1)
+
+    for index in range(100):
+        backend.consume(f"ip-{index}", limit, now=float(index) / 100)
+    assert len(backend) == 3
+
+    backend.consume("late", limit, now=50.0)
+    assert len(backend) == 1
+
+
+@pytest.mark.usefixtures("limiter")
+def test_requests_over_limit_get_429_per_client(client):
+    """Each client IP should have its own bucket and get 429 when it is empty."""
+    first_ip = {"REMOTE_ADDR": "203.0.113.1"}
+    second_ip = {"REMOTE_ADDR": "203.0.113.2"}
+
+    assert client.get("/", environ_overrides=first_ip).status_code == 200
+    assert client.get("/", environ_overrides=first_ip).status_code == 200
+    limited = client.get("/", environ_overrides=first_ip)
+
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert limited.get_json()["error"] == "Too Many Requests"
+    assert client.get("/", environ_overrides=second_ip).status_code == 200
+    assert client.get("/visits").get_json() == {"visits": 3}
+
+
+@pytest.mark.usefixtures("limiter")
+def test_rate_limit_can_key_on_header_and_skips_unlisted_routes(client, monkeypatch):
+    """A configured header should replace the client IP as the bucket key."""
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_KEY_HEADER", "X-Forwarded-For")
+
+    for _ in range(2):
+        client.get("/", headers={"X-Forwarded-For": "198.51.100.7, 10.0.0.1"})
+
+    assert client.get("/", headers={"X-Forwarded-For": "198.51.100.7"}).status_code == 429
+    assert client.get("/", headers={"X-Forwarded-For": "198.51.100.8"}).status_code == 200
+    assert all(client.get("/visits").status_code == 200 for _ in range(5))
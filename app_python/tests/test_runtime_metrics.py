@@ -0,0 +1,88 @@
+"""Tests for procfs-backed runtime metrics and GC pause tracking."""
+
+import gc
+from unittest.mock import Mock
+
+import pytest
+
+from src.metrics import METRICS_REGISTRY
+import src.runtime_metrics as runtime_metrics
+from src.runtime_metrics import RuntimeCollector
+
+
+def _samples(collector) -> dict[tuple[str, tuple], float]:
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in collector.collect()
+        for sample in family.samples
+    }
+
+
+def test_runtime_collector_reads_fake_proc_dir(tmp_path):
+    """Collector should translate procfs status fields into metric samples."""
+    (tmp_path / "status").write_text(
+        "Name:\tgunicorn\n"
+        "VmRSS:\t   2048 kB\n"
+        "Threads:\t4\n"
+        "voluntary_ctxt_switches:\t10\n"
+        "nonvoluntary_ctxt_switches:\t3\n",
+        encoding="ascii",
+    )
+    fd_dir = tmp_path / "fd"
+    fd_dir.mkdir()
+    for fd in range(5):
+        (fd_dir / str(fd)).touch()
+
+    samples = _samples(RuntimeCollector(tmp_path))
+
+    assert samples[("process_resident_memory_bytes", ())] == 2048 * 1024
+    assert samples[("process_threads", ())] == 4
+    assert samples[("process_open_fds", ())] == 5
+    assert samples[("process_context_switches_total", (("type", "voluntary"),))] == 10
+    assert samples[("process_context_switches_total", (("type", "nonvoluntary"),))] == 3
+
+
+def test_runtime_collector_skips_missing_procfs(tmp_path):
+    """Collector should yield nothing when procfs is unavailable."""
+    assert _samples(RuntimeCollector(tmp_path / "missing")) == {}
+
+
+def test_gc_pause_histogram_counts_collections():
+    """A full collection should be observed under generation 2."""
+    before = METRICS_REGISTRY.get_sample_value(
+        "devops_info_gc_pause_seconds_count", {"generation": "2"}
+    ) or 0.0
+
+    gc.collect()
+
+    after = METRICS_REGISTRY.get_sample_value(
+        "devops_info_gc_pause_seconds_count", {"generation": "2"}
+    )
+    assert after is not None and after >= before + 1.0
+
+
+def test_gc_pause_ignores_stop_without_start(monkeypatch):
+    """A stray stop callback must not record a bogus pause."""
+    histogram = Mock()
+    monkeypatch.setattr(runtime_metrics, "_GC_PAUSE_BY_GENERATION", {0: histogram})
+    monkeypatch.setattr(runtime_metrics, "_gc_start_time", None)
+    gc.disable()
+    try:
+        runtime_metrics._record_gc_pause("stop", {"generation": 0})
+        histogram.observe.assert_not_called()
+
+        runtime_metrics._record_gc_pause("start", {"generation": 0})
+        runtime_metrics._record_gc_pause("stop", {"generation": 0})
+    finally:
+        gc.enable()
+    histogram.observe.assert_called_once()
+
+
+@pytest.mark.skipif(not RuntimeCollector().proc_dir.exists(), reason="requires procfs")
+def test_metrics_endpoint_exposes_runtime_metrics(client):
+    """Runtime metrics should be part of the /metrics exposition."""
+    metrics_text = client.get("/metrics").get_data(as_text=True)
+
+    assert "process_resident_memory_bytes " in metrics_text
+    assert "process_open_fds " in metrics_text
+    assert 'process_context_switches_total{type="voluntary"}' in metrics_text
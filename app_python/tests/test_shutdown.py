@@ -0,0 +1,108 @@
+"""Tests for graceful drain during rollouts."""
+
+import os
+import signal
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.flask_instance import app
+from src.metrics import METRICS_REGISTRY
+import src.router as router
+import src.shutdown as shutdown
+from src.shutdown import ShutdownCoordinator, count_in_flight_requests
+
+
+@pytest.fixture()
+def coordinator(monkeypatch):
+    """Install a fresh coordinator in place of the process-wide one."""
+    coordinator = ShutdownCoordinator()
+    monkeypatch.setattr(router, "SHUTDOWN_COORDINATOR", coordinator)
+    monkeypatch.setattr(shutdown, "SHUTDOWN_COORDINATOR", coordinator)
+    return coordinator
+
+
+@pytest.fixture()
+def slow_visits(monkeypatch):
+    """Make GET /visits block until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+    real_get_visits_count = router.get_visits_count
+
+    def _blocking_get_visits_count():
+        started.set()
+        release.wait(timeout=5)
+        return real_get_visits_count()
+
+    monkeypatch.setattr(router, "get_visits_count", _blocking_get_visits_count)
+    yield started, release
+    release.set()
+
+
+def test_drain_waits_for_in_flight_requests_then_flushes(client, coordinator, slow_visits):
+    """Simulate a rollout: probes flip, in-flight work finishes, state is flushed."""
+    started, release = slow_visits
+    flush = Mock()
+    coordinator.register_flush("visit_history", router.flush_visit_history)
+    coordinator.register_flush("spy", flush)
+    client.get("/")
+
+    slow = threading.Thread(target=lambda: app.test_client().get("/visits"))
+    slow.start()
+    assert started.wait(timeout=5)
+
+    coordinator.begin_drain()
+    ready = client.get("/ready")
+    assert ready.status_code == 503
+    assert ready.get_json()["status"] == "draining"
+    assert client.get("/health").status_code == 200
+    assert count_in_flight_requests() == 1
+
+    result = {}
+    drainer = threading.Thread(target=lambda: result.update(ok=coordinator.drain(timeout=5)))
+    drainer.start()
+    drainer.join(timeout=0.2)
+    assert drainer.is_alive(), "drain must wait for the in-flight request"
+    flush.assert_not_called()
+
+    release.set()
+    slow.join(timeout=5)
+    drainer.join(timeout=5)
+
+    assert result == {"ok": True}
+    flush.assert_called_once()
+    assert (router.VISITS_FILE.with_name("visits.history")).exists()
+    assert METRICS_REGISTRY.get_sample_value("devops_info_drain_abandoned_requests") == 0
+    assert METRICS_REGISTRY.get_sample_value("devops_info_drain_duration_seconds") > 0
+
+
+def test_drain_gives_up_at_deadline_and_still_flushes():
+    """Stuck requests must not block shutdown past the deadline."""
+    coordinator = ShutdownCoordinator(in_flight=lambda: 2)
+    failing, flush = Mock(side_effect=OSError("disk gone")), Mock()
+    coordinator.register_flush("failing", failing)
+    coordinator.register_flush("logs", flush)
+
+    assert coordinator.drain(timeout=0.1) is False
+
+    flush.assert_called_once()
+    assert METRICS_REGISTRY.get_sample_value("devops_info_drain_abandoned_requests") == 2
+
+
+def test_sigterm_starts_drain_and_stops_gunicorn_worker(coordinator, monkeypatch):
+    """SIGTERM should drain in the background and then end the worker loop."""
+    monkeypatch.setattr(shutdown, "SHUTDOWN_DRAIN_DELAY_SECONDS", 0.0)
+    worker = SimpleNamespace(alive=True)
+    previous = signal.getsignal(signal.SIGTERM)
+    try:
+        shutdown.install_gunicorn_drain(worker)
+        os.kill(os.getpid(), signal.SIGTERM)
+        for thread in threading.enumerate():
+            if thread.name == "shutdown-drain":
+                thread.join(timeout=5)
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+    assert coordinator.draining
+    assert worker.alive is False
@@ -0,0 +1,79 @@
+"""Tests for the visits storage fault-injection harness."""
+
+import errno
+
+import pytest
+
+from benchmarks.storage_faults import FaultProfile, FaultyPath, constant, inject_visits_faults
+import src.router as router
+
+
+def test_faulty_path_injects_latency_from_distribution(tmp_path):
+    """Every storage call should sleep for a value drawn from the profile."""
+    delays = []
+    path = FaultyPath(
+        tmp_path / "visits", FaultProfile("slow", latency=constant(0.5)), sleep=delays.append
+    )
+
+    path.write_text("3\n", encoding="utf-8")
+    path.stat()
+
+    assert path.read_text(encoding="utf-8") == "3\n"
+    assert delays == [0.5, 0.5, 0.5]
+    assert path.injected["delayed"] == 3
+
+
+def test_faulty_path_raises_configured_errno_and_keeps_file(tmp_path):
+    """Injected write errors should leave the previous contents in place."""
+    (tmp_path / "visits").write_text("3\n", encoding="utf-8")
+    profile = FaultProfile("full", write_error_rate=1.0, error_codes=(errno.ENOSPC,))
+    path = FaultyPath(tmp_path / "visits", profile)
+
+    with pytest.raises(OSError) as excinfo:
+        path.write_text("4\n", encoding="utf-8")
+
+    assert excinfo.value.errno == errno.ENOSPC
+    assert (tmp_path / "visits").read_text(encoding="utf-8") == "3\n"
+    assert path.injected == {"write_ENOSPC": 1}
+
+
+def test_faulty_path_torn_write_stores_a_strict_prefix(tmp_path):
+    """A torn write should persist part of the data and then fail with EIO."""
+    path = FaultyPath(tmp_path / "visits", FaultProfile("torn", torn_write_rate=1.0))
+
+    with pytest.raises(OSError) as excinfo:
+        path.write_text("12345\n", encoding="utf-8")
+
+    written = (tmp_path / "visits").read_text(encoding="utf-8")
+    assert excinfo.value.errno == errno.EIO
+    assert "12345\n".startswith(written) and written != "12345\n"
+
+
+def test_derived_paths_share_profile_and_counts(tmp_path):
+    """Sibling files such as the visit history should get the same faults."""
+    delays = []
+    path = FaultyPath(
+        tmp_path / "visits", FaultProfile("slow", latency=constant(0.5)), sleep=delays.append
+    )
+
+    history = path.with_name("visits.history")
+    history.write_bytes(b"VHST")
+
+    assert isinstance(history, FaultyPath)
+    assert isinstance(path.parent / "other", FaultyPath)
+    assert history.read_bytes() == b"VHST"
+    assert delays == [0.5, 0.5]
+    assert path.injected["delayed"] == 2
+
+
+def test_inject_visits_faults_routes_router_storage_and_restores(client):
+    """Read errors injected into the router should surface as the usual fallback."""
+    original = router.VISITS_FILE
+    router.VISITS_FILE.write_text("7\n", encoding="utf-8")
+
+    with inject_visits_faults(FaultProfile("eio", read_error_rate=1.0)) as faulty:
+        response = client.get("/visits")
+
+    assert response.get_json() == {"visits": 0}
+    assert faulty.injected == {"read_EIO": 1}
+    assert router.VISITS_FILE is original
@@ -0,0 +1,94 @@
+"""Tests for ring-buffer visit history and the /visits/history endpoint."""
+
+from src.visit_history import RingCounter, VisitHistory
+
+HOUR = 3600
+
+
+def test_ring_counter_buckets_and_expires_old_slots():
+    """Counts should land in their bucket and stale slots read as zero."""
+    ring = RingCounter(slots=3, width_seconds=60)
+
+    ring.add(0)
+    ring.add(59)
+    ring.add(60)
+    assert ring.series(119) == (-60, [0, 2, 1])
+
+    # Three buckets later slot 0 is reused and must not leak its old count.
+    ring.add(180)
+    assert ring.series(180) == (60, [1, 0, 1])
+    assert ring.series(10 * 60) == (8 * 60, [0, 0, 0])
+
+
+def test_ring_memory_is_fixed_regardless_of_traffic():
+    """Recording visits must not grow the underlying arrays."""
+    history = VisitHistory(path=None, hours=2)
+    sizes = [len(ring) for ring in history._rings()]
+
+    for second in range(0, 5 * HOUR, 7):
+        history.minutes.add(second)
+        history.hours.add(second)
+
+    assert [len(ring) for ring in history._rings()] == sizes == [120, 120, 2, 2]
+
+
+def test_history_round_trips_through_compact_file(tmp_path):
+    """Persisted history should restore exactly and stay a few KB in size."""
+    path = tmp_path / "visits.history"
+    history = VisitHistory(path, hours=24)
+    for second in (10, 20, 70, HOUR + 5):
+        history.record(10 * HOUR + second)
+        history.flush(10 * HOUR + second)
+
+    restored = VisitHistory(path, hours=24)
+
+    assert restored.snapshot(11 * HOUR + 30) == history.snapshot(11 * HOUR + 30)
+    assert sum(restored.snapshot(11 * HOUR + 30)["minute"]["counts"]) == 4
+    assert path.stat().st_size == 13 + (24 * 60 + 24) * 8
+
+
+def test_workers_sharing_a_file_add_up_instead_of_overwriting(tmp_path):
+    """Flushes from several workers should merge into the file, not replace it."""
+    path = tmp_path / "visits.history"
+    workers = [VisitHistory(path, hours=24) for _ in range(3)]
+    for offset, worker in enumerate(workers):
+        for second in range(offset + 1):
+            worker.record(10 * HOUR + second)
+
+    for worker in workers:
+        worker.flush(10 * HOUR + 30)
+    workers[0].record(10 * HOUR + 40)
+
+    snapshot = workers[0].snapshot(10 * HOUR + 50)
+    assert snapshot["minute"]["counts"][-1] == 7
+    assert snapshot["hour"]["counts"][-1] == 7
+    assert sum(VisitHistory(path).snapshot(10 * HOUR + 50)["hour"]["counts"]) == 6
+
+
+def test_history_with_mismatched_size_starts_empty(tmp_path):
+    """A file written for another VISIT_HISTORY_HOURS should be discarded."""
+    path = tmp_path / "visits.history"
+    history = VisitHistory(path, hours=1)
+    history.record(100)
+    history.flush(100)
+
+    restored = VisitHistory(path, hours=2)
+
+    assert sum(restored.snapshot(100)["minute"]["counts"]) == 0
+
+
+def test_visits_history_endpoint_counts_index_calls(client):
+    """Each GET / should add one visit to the current minute and hour buckets."""
+    client.get("/")
+    client.get("/?fields=service")
+    client.get("/visits")
+
+    payload = client.get("/visits/history").get_json()
+
+    assert payload["minute"]["interval_seconds"] == 60
+    assert payload["hour"]["interval_seconds"] == 3600
+    assert len(payload["minute"]["counts"]) == 24 * 60
+    assert len(payload["hour"]["counts"]) == 24
+    assert payload["minute"]["counts"][-1] + payload["minute"]["counts"][-2] == 2
+    assert payload["hour"]["counts"][-1] + payload["hour"]["counts"][-2] == 2
+    assert payload["minute"]["start"].endswith("Z")
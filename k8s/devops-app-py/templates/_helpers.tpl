@@ -58,6 +58,13 @@ Create the service name.
 {{- printf "%s-service" (include "devops-app-py.fullname" .) | trunc 63 | trimSuffix "-" }}
 {{- end }}
 
+{{/*
+Create the headless service name used for peer discovery.
+*/}}
+{{- define "devops-app-py.headlessServiceName" -}}
+{{- printf "%s-headless" (include "devops-app-py.fullname" .) | trunc 63 | trimSuffix "-" }}
+{{- end }}
+
 {{/*
 Create the blue-green preview service name.
 */}}
@@ -139,6 +146,9 @@ metadata:
     {{- end }}
 spec:
   serviceAccountName: {{ include "devops-app-py.serviceAccountName" . }}
+  {{- with .Values.terminationGracePeriodSeconds }}
+  terminationGracePeriodSeconds: {{ . }}
+  {{- end }}
   containers:
     - name: {{ include "devops-app-py.name" . }}
       image: "{{ .Values.image.repository }}:{{ .Values.image.tag | default .Chart.AppVersion }}"
@@ -209,6 +219,16 @@ Render non-secret environment variables.
 - name: {{ .name }}
   value: {{ .value | quote }}
 {{- end }}
+{{- if .Values.clusterView.enabled }}
+- name: CLUSTER_PEERS_DNS
+  value: {{ printf "%s.%s.svc.cluster.local" (include "devops-app-py.headlessServiceName" .) .Release.Namespace | quote }}
+- name: CLUSTER_PEER_PORT
+  value: {{ .Values.containerPort | quote }}
+- name: POD_IP
+  valueFrom:
+    fieldRef:
+      fieldPath: status.podIP
+{{- end }}
 {{- end }}
 
 {{/*
@@ -222,7 +242,7 @@ Render the chart-managed config.json file.
 Render pod checksum annotations for config-driven rollouts.
 */}}
 {{- define "devops-app-py.configChecksums" -}}
-{{- if .Values.config.file.enabled }}
+{{- if and .Values.config.file.enabled (ne .Values.config.file.reloadStrategy "hot-reload") }}
 checksum/config-file: {{ include "devops-app-py.renderedConfigJson" . | sha256sum | quote }}
 {{- end }}
 {{- if .Values.config.env.enabled }}